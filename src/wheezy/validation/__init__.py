@@ -1,8 +1,37 @@
 # flake8: noqa
 
 from wheezy.validation.mixin import ValidationMixin
-from wheezy.validation.model import try_update_model
 from wheezy.validation.validator import Validator
 
 __all__ = ("ValidationMixin", "try_update_model", "Validator")
 __version__ = "0.1"
+
+
+def __getattr__(name):
+    # try_update_model is imported on first use
+    if name == "try_update_model":
+        from wheezy.validation.model import try_update_model
+
+        globals()[name] = try_update_model
+        return try_update_model
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def warmup():
+    """Does what is otherwise deferred until first use: compiles
+    regular expressions of `email`, `slug`, `scientific`, `base64`
+    and `urlsafe_base64` rules, imports `try_update_model` and patches
+    strptime cache size.
+    """
+    from wheezy.validation import model, rules
+
+    for rule in (
+        rules.base64,
+        rules.email,
+        rules.scientific,
+        rules.slug,
+        rules.urlsafe_base64,
+    ):
+        rule.regex.compile()
+    model.patch_strptime()
+    __getattr__("try_update_model")
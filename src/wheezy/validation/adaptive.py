@@ -0,0 +1,184 @@
+from time import perf_counter
+
+from wheezy.validation.comp import ref_getter
+from wheezy.validation.i18n import resolve_gettext
+from wheezy.validation.validator import Validator
+
+
+class PinnedRule(object):
+    """Keeps ``rule`` in its declared position, the rules of a field
+    are reordered by ``AdaptiveValidator`` only between pinned ones.
+    Use it for rules with side effects or that depend on order.
+    """
+
+    __slots__ = "rule"
+
+    def __init__(self, rule):
+        self.rule = rule
+
+    def validate(self, value, name, model, result, gettext):
+        return self.rule.validate(value, name, model, result, gettext)
+
+
+class RuleStats(object):
+    """Cost and failures observed for a rule."""
+
+    __slots__ = ("index", "pinned", "calls", "failures", "elapsed")
+
+    def __init__(self, index, pinned=False):
+        self.index = index
+        self.pinned = pinned
+        self.calls = 0
+        self.failures = 0
+        self.elapsed = 0.0
+
+    def score(self):
+        """Average cost divided by smoothed failure rate, the lower the
+        score the earlier the rule runs.
+        """
+        if not self.calls:
+            return float("inf")
+        return (
+            self.elapsed
+            * (self.calls + 2)
+            / (self.calls * (self.failures + 1))
+        )
+
+
+class AdaptiveValidator(Validator):
+    """Validator that reorders rules of a field so cheap and likely
+    to fail rules run first. Every ``sample``-th call records cost and
+    failures of each rule; every ``epoch`` calls the rules are
+    reordered. The order, and so the first error reported for a field,
+    does not change within an epoch.
+
+    The order is applied with ``stop`` set ``True`` only, otherwise
+    rules run in declared order. Rules wrapped with ``pin`` keep their
+    declared position.
+
+    Unlike `Validator` it alters its state while validating, the call
+    counter, observations and rule order are updated without a lock,
+    concurrent calls may lose observations.
+    """
+
+    __slots__ = ("declared", "plan", "epoch", "sample", "calls")
+
+    def __init__(self, mapping, epoch=10000, sample=10):
+        super(AdaptiveValidator, self).__init__(mapping)
+        declared = []
+        plan = []
+        for name, rules in self.rules:
+            stats = tuple(
+                [
+                    RuleStats(i, isinstance(rule, PinnedRule))
+                    for i, rule in enumerate(rules)
+                ]
+            )
+            rules = tuple(
+                [
+                    rule.rule if isinstance(rule, PinnedRule) else rule
+                    for rule in rules
+                ]
+            )
+            declared.append((name, rules))
+            plan.append((name, rules, stats))
+        self.rules = tuple(declared)
+        self.declared = Validator({})
+        self.declared.rules = self.rules
+        self.declared.inner = self.inner
+        self.plan = tuple(plan)
+        self.epoch = epoch
+        self.sample = sample
+        self.calls = 0
+
+    def validate(
+        self, model, results, stop=True, translations=None, gettext=None
+    ):
+        """Validates given `model`, see `Validator.validate`."""
+        self.calls = calls = self.calls + 1
+        if calls % self.epoch == 0:
+            self.reorder()
+        if calls % self.sample:
+            if not stop:
+                return self.declared.validate(
+                    model, results, stop, translations, gettext
+                )
+            return super(AdaptiveValidator, self).validate(
+                model, results, stop, translations, gettext
+            )
+        gettext = resolve_gettext(translations, gettext)
+        succeed = True
+        getter = ref_getter(model)
+        for name, rules, stats in self.plan:
+            pairs = zip(rules, stats)
+            if not stop:
+                pairs = sorted(pairs, key=declared_index)
+            value = getter(model, name)
+            result = []
+            for rule, s in pairs:
+                start = perf_counter()
+                rule_succeed = rule.validate(
+                    value, name, model, result, gettext
+                )
+                s.elapsed += perf_counter() - start
+                s.calls += 1
+                if not rule_succeed:
+                    s.failures += 1
+                    succeed = False
+                    if stop:
+                        break
+            if result:
+                results[name] = result
+        for name, validator in self.inner:
+            succeed &= validator.validate(
+                getter(model, name), results, stop, None, gettext
+            )
+        return succeed
+
+    def reorder(self):
+        """Reorders rules of each field by score observed. Rules keep
+        relative declared order if scores are equal. Observations of
+        previous epochs are decayed by half.
+        """
+        plan = []
+        for name, rules, stats in self.plan:
+            pairs = sorted(zip(rules, stats), key=declared_index)
+            ordered = []
+            segment = []
+            for pair in pairs:
+                if pair[1].pinned:
+                    segment.sort(key=score)
+                    ordered.extend(segment)
+                    ordered.append(pair)
+                    segment = []
+                else:
+                    segment.append(pair)
+            segment.sort(key=score)
+            ordered.extend(segment)
+            for s in stats:
+                s.calls /= 2.0
+                s.failures /= 2.0
+                s.elapsed /= 2.0
+            plan.append(
+                (
+                    name,
+                    tuple([rule for rule, s in ordered]),
+                    tuple([s for rule, s in ordered]),
+                )
+            )
+        self.plan = tuple(plan)
+        self.rules = tuple([(name, rules) for name, rules, stats in plan])
+
+
+pin = PinnedRule
+
+
+# region: internal details
+
+
+def declared_index(pair):
+    return pair[1].index
+
+
+def score(pair):
+    return pair[1].score()
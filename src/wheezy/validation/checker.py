@@ -1,3 +1,6 @@
+from wheezy.validation.comp import import_name
+
+
 class Checker(object):
     """Intended to be used by unittest/doctest for validation rules.
     It is recommended to use test case per validator, test
@@ -14,9 +17,7 @@ class Checker(object):
     def use(self, validator):
         """Use `validator` for next series of checks."""
         if isinstance(validator, str):
-            namespace, name = validator.rsplit(".", 1)
-            obj = __import__(namespace, None, None, [name], 0)
-            self.validator = getattr(obj, name)
+            self.validator = import_name(validator)
         else:
             self.validator = validator
 
@@ -0,0 +1,253 @@
+from wheezy.validation.i18n import resolve_gettext
+from wheezy.validation.rules import (
+    Base64Rule,
+    EmailRule,
+    LazyPattern,
+    LengthRule,
+    NotNoneRule,
+    OneOfRule,
+    RangeRule,
+    RegexRule,
+    RequiredRule,
+    ScientificRule,
+    SlugRule,
+    URLSafeBase64Rule,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: nocover
+    np = None
+
+
+def validate_columns(
+    validator, columns, stop=True, translations=None, gettext=None
+):
+    """Validates `columns`, a dict that maps attribute name to a column
+    of values, e.g. a list or numpy array. Returns a dict that maps an
+    index of row that failed validation to its results, see
+    `Validator.validate_many`.
+
+    If numpy is available, `required`, `not_none`, `length`, `range`,
+    `one_of` and `regex` rules evaluate a column at once, error
+    messages are produced for the failed rows only. A list column is
+    converted to numpy array once, values of mixed types are kept as
+    objects. Other rules are validated row by row.
+    """
+    gettext = resolve_gettext(translations, gettext)
+    size = None
+    for column in columns.values():
+        size = len(column)
+        break
+    if not size:
+        return {}
+    errors = {}
+    for name, rules in validator.rules:
+        column = columns[name]
+        if np is None:
+            array = None
+            active = list(range(size))
+        else:
+            array = as_array(column)
+            active = np.arange(size)
+        for rule in rules:
+            if not len(active):
+                break
+            failed = validate_column(
+                rule, column, array, name, columns, active, errors, gettext
+            )
+            if stop and len(failed):
+                if np is None:
+                    failed = set(failed)
+                    active = [i for i in active if i not in failed]
+                else:
+                    active = np.setdiff1d(active, failed, assume_unique=True)
+    for name, inner in validator.inner:
+        column = columns[name]
+        for i in range(size):
+            results = {}
+            if not inner.validate(column[i], results, stop, None, gettext):
+                row_errors = errors.setdefault(i, {})
+                for key, result in results.items():
+                    row_errors.setdefault(key, []).extend(result)
+    return errors
+
+
+class Row(object):
+    """Row of columns, used as a model by rules that access other
+    attributes, e.g. `compare` or `predicate`.
+    """
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns, index):
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, name):
+        return self.columns[name][self.index]
+
+    def __getattr__(self, name):
+        try:
+            return self.columns[name][self.index]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+
+# region: internal details
+
+
+def validate_column(
+    rule, column, array, name, columns, active, errors, gettext
+):
+    """Applies `rule` to rows of `column` at `active` indices, errors of
+    the failed rows are added to `errors`. Returns indices of rows that
+    failed. The `array` is `column` as numpy array, if numpy is
+    available.
+    """
+    candidates = active
+    if array is not None:
+        vectorize = vectorizers.get(type(rule))
+        mask = vectorize and vectorize(rule, array)
+        if mask is not None:
+            candidates = active[mask[active]]
+    failed = []
+    for i in candidates.tolist() if np is not None else candidates:
+        result = []
+        if not rule.validate(
+            column[i], name, Row(columns, i), result, gettext
+        ):
+            failed.append(i)
+        if result:
+            errors.setdefault(i, {}).setdefault(name, []).extend(result)
+    return failed
+
+
+def as_array(column):
+    """Returns `column` as numpy array. If values are of types that
+    numpy converts to another kind, e.g. numbers and strings to
+    strings, they are kept as objects.
+    """
+    if isinstance(column, np.ndarray):
+        return column
+    array = np.asarray(column)
+    if array.ndim == 1:
+        if array.dtype.kind == "O":
+            return array
+        kind_type = kind_types.get(array.dtype.kind)
+        if kind_type is not None and all(
+            [issubclass(t, kind_type) for t in set(map(type, column))]
+        ):
+            return array
+    return np.fromiter(column, dtype=object, count=len(column))
+
+
+def is_str(column):
+    return column.dtype.kind == "U"
+
+
+def is_number(column):
+    return column.dtype.kind in "iuf"
+
+
+def is_numbers(values):
+    return all(
+        [
+            isinstance(v, (int, float)) and not isinstance(v, bool)
+            for v in values
+        ]
+    )
+
+
+def vectorize_required(rule, column):
+    kind = column.dtype.kind
+    if kind == "b":
+        return ~column
+    if kind in "iuf":
+        return column == 0
+    if kind == "U":
+        return np.char.str_len(column) == 0
+    return None
+
+
+def vectorize_not_none(rule, column):
+    if column.dtype.kind == "O":
+        return np.equal(column, None)
+    return np.zeros(len(column), dtype=bool)
+
+
+def vectorize_length(rule, column):
+    if not is_str(column):
+        return None
+    length = np.char.str_len(column)
+    strategy = rule.validate.__name__
+    if strategy == "check_min":
+        return length < rule.min
+    if strategy == "check_max":
+        return length > rule.max
+    if strategy == "check_equal":
+        return length != rule.min
+    if strategy == "check_range":
+        return (length < rule.min) | (length > rule.max)
+    return np.zeros(len(column), dtype=bool)
+
+
+def vectorize_range(rule, column):
+    if not is_number(column):
+        return None
+    strategy = rule.validate.__name__
+    if strategy == "check_min" and is_numbers((rule.min,)):
+        return column < rule.min
+    if strategy == "check_max" and is_numbers((rule.max,)):
+        return column > rule.max
+    if strategy == "check_range" and is_numbers((rule.min, rule.max)):
+        return (column < rule.min) | (column > rule.max)
+    return None
+
+
+def vectorize_one_of(rule, column):
+    if is_str(column):
+        if not all([isinstance(item, str) for item in rule.items]):
+            return None
+    elif not is_number(column) or not is_numbers(rule.items):
+        return None
+    return ~np.isin(column, rule.items)
+
+
+def vectorize_regex(rule, column):
+    if not is_str(column):
+        return None
+    values, inverse = np.unique(column, return_inverse=True)
+    if isinstance(rule.regex, LazyPattern):
+        rule.regex.compile()
+    search = rule.regex.search
+    found = np.array([search(v) is not None for v in values.tolist()])
+    if rule.validate.__name__ == "check_found":
+        return ~found[inverse]
+    return found[inverse]
+
+
+kind_types = {
+    "U": str,
+    "b": bool,
+    "i": int,
+    "u": int,
+    "f": (int, float),
+}
+
+vectorizers = {
+    RequiredRule: vectorize_required,
+    NotNoneRule: vectorize_not_none,
+    LengthRule: vectorize_length,
+    RangeRule: vectorize_range,
+    OneOfRule: vectorize_one_of,
+    RegexRule: vectorize_regex,
+    SlugRule: vectorize_regex,
+    EmailRule: vectorize_regex,
+    ScientificRule: vectorize_regex,
+    Base64Rule: vectorize_regex,
+    URLSafeBase64Rule: vectorize_regex,
+}
@@ -1,6 +1,34 @@
+from operator import getitem
+
+
 def ref_getter(model):
-    # if model is a dict
+    """Returns a function ``getter(model, name)`` that returns
+    attribute `name` of `model` or item `name` if `model` is a
+    mapping. A named tuple is accessed by attributes.
+    """
     if hasattr(model, "__iter__"):
-        return type(model).__getitem__
-    else:
-        return getattr
+        if isinstance(model, tuple):
+            return getattr
+        return getitem
+    return getattr
+
+
+def path_value(model, names):
+    """Returns a value of nested attribute (or item) of `model` by a
+    sequence of `names`, e.g. ``("address", "city")``. A part of path
+    that is `None` gives `None`.
+    """
+    for name in names:
+        if model is None:
+            return None
+        model = ref_getter(model)(model, name)
+    return model
+
+
+def import_name(name):
+    """Returns an object by its dotted path, e.g.
+    ``myapp.validation.user_validator``.
+    """
+    namespace, name = name.rsplit(".", 1)
+    obj = __import__(namespace, None, None, [name], 0)
+    return getattr(obj, name)
@@ -0,0 +1,434 @@
+import sys
+from argparse import ArgumentParser
+from decimal import Decimal
+from math import isfinite
+from re import Pattern
+
+from wheezy.validation.comp import import_name, ref_getter
+from wheezy.validation.i18n import resolve_gettext
+from wheezy.validation.messages import MessageTemplate
+from wheezy.validation.rules import (
+    Base64Rule,
+    EmailRule,
+    IgnoreRule,
+    LazyPattern,
+    LengthRule,
+    MissingRule,
+    NotNoneRule,
+    OneOfRule,
+    PredicateRule,
+    RangeRule,
+    RegexRule,
+    RequiredRule,
+    ScientificRule,
+    SlugRule,
+    URLSafeBase64Rule,
+    ValuePredicateRule,
+    required_but_missing,
+)
+from wheezy.validation.validator import Validator
+
+
+def compile_validator(validator):
+    """Returns a function specialized for `validator` with the same
+    contract as `Validator.validate`.
+    """
+    return Compiler(validator).compile()
+
+
+class Compiler(object):
+    """Translates a validator into python source of a function with
+    field access, rule calls and `stop` handling unrolled. Well known
+    rules are inlined, nested validators are flattened into a single
+    function.
+
+    Rules are captured at compile time, the validator must be compiled
+    again to reflect any change made afterwards.
+    """
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.namespace = {
+            "ref_getter": ref_getter,
+            "resolve_gettext": resolve_gettext,
+            "required_but_missing": required_but_missing,
+        }
+        self.paths = {}
+        self.lines = []
+        self.nested = 0
+
+    def compile(self):
+        """Returns the specialized validation function."""
+        source = self.source()
+        namespace = dict(self.namespace)
+        code = compile(source, "<validator 0x%x>" % id(self.validator), "exec")
+        exec(code, namespace)  # nosec
+        validate = namespace["validate"]
+        validate.__source__ = source
+        return validate
+
+    def source(self):
+        """Returns python source of the specialized function."""
+        if not self.lines:
+            self.emit_function()
+        return "\n".join(self.lines) + "\n"
+
+    def module(self, name):
+        """Returns python source of a standalone module with the
+        specialized `validate` function, for the validator importable
+        by dotted `name`.
+
+        Strings, numbers, tuples of them and regular expressions used
+        by rules are emitted as literals. Other objects, e.g. custom
+        rules or predicates, are referenced from the validator, which
+        is imported by `name` in this case.
+        """
+        source = self.source()
+        imports = set(
+            [
+                "from wheezy.validation.comp import ref_getter",
+                "from wheezy.validation.i18n import resolve_gettext",
+                "from wheezy.validation.rules import required_but_missing",
+            ]
+        )
+        constants = []
+        referenced = False
+        for path, ref in self.paths.items():
+            expression = constant(self.namespace[ref], imports)
+            if expression is None:
+                expression = path
+                referenced = True
+            constants.append("%s = %s" % (ref, expression))
+        if referenced:
+            imports.remove("from wheezy.validation.comp import ref_getter")
+            imports.add(
+                "from wheezy.validation.comp import import_name, ref_getter"
+            )
+            constants.insert(0, "validator = import_name(%r)" % name)
+        return "\n".join(
+            [
+                "# Generated by wheezy.validation.compiler from",
+                "# %s, do not edit." % name,
+                "",
+            ]
+            + sorted(imports, key=import_order)
+            + ["", ""]
+            + constants
+            + ["", "", source]
+        )
+
+    def emit_function(self):
+        emit = self.emit
+        emit(
+            0,
+            "def validate(model, results, stop=True, translations=None, "
+            "gettext=None):",
+        )
+        emit(1, "gettext = resolve_gettext(translations, gettext)")
+        emit(1, "succeed = True")
+        self.emit_validator(1, self.validator, "validator", "model", "getter")
+        emit(1, "return succeed")
+
+    def emit_validator(self, level, validator, path, model, getter):
+        """Emits validation of `model` by `validator`. Nested validators
+        are flattened into the same function, except those of a type
+        other than `Validator`, which are called.
+        """
+        emit = self.emit
+        if not validator.rules and not validator.inner:
+            return
+        emit(level, "%s = ref_getter(%s)" % (getter, model))
+        for i, (name, rules) in enumerate(validator.rules):
+            self.emit_field(
+                level, name, rules, "%s.rules[%d]" % (path, i), model, getter
+            )
+        for i, (name, inner) in enumerate(validator.inner):
+            p = "%s.inner[%d]" % (path, i)
+            value = "%s(%s, %s)" % (
+                getter,
+                model,
+                self.literal(name, p + "[0]"),
+            )
+            if type(inner) is Validator:
+                self.nested += 1
+                inner_model = "model%d" % self.nested
+                emit(level, "%s = %s" % (inner_model, value))
+                self.emit_validator(
+                    level,
+                    inner,
+                    p + "[1]",
+                    inner_model,
+                    "getter%d" % self.nested,
+                )
+                continue
+            emit(
+                level,
+                "if not %s(%s, results, stop, None, gettext):"
+                % (self.ref(inner.validate, p + "[1].validate"), value),
+            )
+            emit(level + 1, "succeed = False")
+
+    def emit_field(self, level, name, rules, path, model, getter):
+        rules = [
+            (rule, "%s[1][%d]" % (path, i))
+            for i, rule in enumerate(rules)
+            if not always_succeed(rule)
+        ]
+        if not rules:
+            return
+        emit = self.emit
+        key = self.literal(name, path + "[0]")
+        emit(level, "value = %s(%s, %s)" % (getter, model, key))
+        emit(level, "result = []")
+        unrolled = len(rules) > 1
+        if unrolled:
+            emit(level, "while True:")
+            level += 1
+        for rule, rule_path in rules:
+            self.emit_rule(level, key, rule, rule_path, model)
+            emit(level + 1, "succeed = False")
+            if unrolled:
+                emit(level + 1, "if stop:")
+                emit(level + 2, "break")
+        if unrolled:
+            emit(level, "break")
+            level -= 1
+        emit(level, "if result:")
+        emit(level + 1, "results[%s] = result" % key)
+
+    def emit_rule(self, level, key, rule, path, model):
+        """Emits a condition that holds if `rule` fails, followed by
+        a statement that appends error message to result.
+        """
+        emit = self.emit
+        inline = inliners.get(type(rule))
+        condition = inline and inline(self, rule, path, model)
+        if not condition:
+            emit(
+                level,
+                "if not %s(value, %s, %s, result, gettext):"
+                % (self.ref(rule.validate, path + ".validate"), key, model),
+            )
+            return
+        condition, args = condition
+        emit(level, "if %s:" % condition)
+        message = "gettext(%s)" % self.ref(
+            rule.message_template, path + ".message_template"
+        )
+        if args:
+            message += " %% {%s}" % ", ".join(
+                "%r: %s" % (k, self.ref(getattr(rule, a), path + "." + a))
+                for k, a in args
+            )
+        emit(level + 1, "result.append(%s)" % message)
+
+    def emit(self, level, line):
+        self.lines.append("    " * level + line)
+
+    def ref(self, obj, path):
+        """Returns a name generated code uses to refer to `obj`.
+        The `path` is an expression that evaluates to `obj` relative
+        to the validator.
+        """
+        try:
+            return self.paths[path]
+        except KeyError:
+            name = "c%d" % len(self.paths)
+            self.paths[path] = name
+            self.namespace[name] = obj
+            return name
+
+    def literal(self, obj, path):
+        if type(obj) is str:
+            return repr(obj)
+        return self.ref(obj, path)
+
+
+def main(args=None):
+    """Command line entry point, writes a module with the specialized
+    `validate` function for a validator given by dotted path::
+
+        python -m wheezy.validation.compiler myapp.validation.user_validator \\
+            -o myapp/user_validator.py
+    """
+    parser = ArgumentParser(
+        prog="python -m wheezy.validation.compiler",
+        description="Emits a validator as a python module.",
+    )
+    parser.add_argument(
+        "validator", help="dotted path to validator, e.g. myapp.v.user"
+    )
+    parser.add_argument("-o", "--output", help="output file, default stdout")
+    options = parser.parse_args(args)
+    source = Compiler(import_name(options.validator)).module(options.validator)
+    if options.output:
+        with open(options.output, "w", encoding="UTF-8") as f:
+            f.write(source)
+    else:
+        sys.stdout.write(source)
+    return 0
+
+
+# region: internal details
+
+
+def constant(obj, imports):
+    """Returns python expression of `obj`, if it can be expressed
+    as a literal, otherwise `None`. Imports the expression needs are
+    added to `imports`.
+    """
+    t = type(obj)
+    if obj is None or t in (bool, int, str, bytes):
+        return repr(obj)
+    if t is float:
+        return isfinite(obj) and repr(obj) or None
+    if t is Decimal:
+        imports.add("from decimal import Decimal")
+        return repr(obj)
+    if t is MessageTemplate:
+        imports.add("from wheezy.validation.messages import MessageTemplate")
+        return "MessageTemplate(%r, %r)" % (obj.code, str(obj))
+    if t is tuple:
+        items = [constant(item, imports) for item in obj]
+        if None in items:
+            return None
+        if len(items) == 1:
+            return "(%s,)" % items[0]
+        return "(%s)" % ", ".join(items)
+    regex = getattr(obj, "__self__", None)
+    if (
+        isinstance(regex, Pattern)
+        and isinstance(regex.pattern, str)
+        and obj == regex.search
+    ):
+        imports.add("import re")
+        return "re.compile(%r, %d).search" % (regex.pattern, regex.flags)
+    return None
+
+
+def import_order(line):
+    return line.startswith("from wheezy."), line.startswith("from "), line
+
+
+def strategy(rule, name):
+    """Checks if `rule` selected validation strategy `name` at
+    initialization.
+    """
+    return rule.validate == getattr(rule, name, None)
+
+
+def always_succeed(rule):
+    t = type(rule)
+    if t is IgnoreRule:
+        return True
+    return t in (LengthRule, RangeRule) and strategy(rule, "succeed")
+
+
+def inline_required(c, rule, path, model):
+    return "not value or value in required_but_missing", ()
+
+
+def inline_not_none(c, rule, path, model):
+    return "value is None", ()
+
+
+def inline_missing(c, rule, path, model):
+    return "value and value not in required_but_missing", ()
+
+
+def inline_length(c, rule, path, model):
+    if strategy(rule, "check_min"):
+        return (
+            "value is not None and len(value) < %s"
+            % c.ref(rule.min, path + ".min"),
+            (("min", "min"),),
+        )
+    if strategy(rule, "check_max"):
+        return (
+            "value is not None and len(value) > %s"
+            % c.ref(rule.max, path + ".max"),
+            (("max", "max"),),
+        )
+    if strategy(rule, "check_equal"):
+        return (
+            "value is not None and len(value) != %s"
+            % c.ref(rule.min, path + ".min"),
+            (("len", "min"),),
+        )
+    if strategy(rule, "check_range"):
+        return (
+            "value is not None and (len(value) < %s or len(value) > %s)"
+            % (c.ref(rule.min, path + ".min"), c.ref(rule.max, path + ".max")),
+            (("min", "min"), ("max", "max")),
+        )
+    return None
+
+
+def inline_range(c, rule, path, model):
+    if strategy(rule, "check_min"):
+        return (
+            "value is not None and value < %s"
+            % c.ref(rule.min, path + ".min"),
+            (("min", "min"),),
+        )
+    if strategy(rule, "check_max"):
+        return (
+            "value is not None and value > %s"
+            % c.ref(rule.max, path + ".max"),
+            (("max", "max"),),
+        )
+    if strategy(rule, "check_range"):
+        return (
+            "value is not None and (value < %s or value > %s)"
+            % (c.ref(rule.min, path + ".min"), c.ref(rule.max, path + ".max")),
+            (("min", "min"), ("max", "max")),
+        )
+    return None
+
+
+def inline_regex(c, rule, path, model):
+    if isinstance(rule.regex, LazyPattern):
+        rule.regex.compile()
+    search = c.ref(rule.regex.search, path + ".regex.search")
+    if strategy(rule, "check_found"):
+        return "value is not None and not %s(value)" % search, ()
+    if strategy(rule, "check_not_found"):
+        return "value is not None and %s(value)" % search, ()
+    return None
+
+
+def inline_one_of(c, rule, path, model):
+    return "value not in %s" % c.ref(rule.items, path + ".items"), ()
+
+
+def inline_predicate(c, rule, path, model):
+    return (
+        "not %s(%s)" % (c.ref(rule.predicate, path + ".predicate"), model),
+        (),
+    )
+
+
+def inline_value_predicate(c, rule, path, model):
+    return "not %s(value)" % c.ref(rule.predicate, path + ".predicate"), ()
+
+
+inliners = {
+    RequiredRule: inline_required,
+    NotNoneRule: inline_not_none,
+    MissingRule: inline_missing,
+    LengthRule: inline_length,
+    RangeRule: inline_range,
+    RegexRule: inline_regex,
+    SlugRule: inline_regex,
+    EmailRule: inline_regex,
+    ScientificRule: inline_regex,
+    Base64Rule: inline_regex,
+    URLSafeBase64Rule: inline_regex,
+    OneOfRule: inline_one_of,
+    PredicateRule: inline_predicate,
+    ValuePredicateRule: inline_value_predicate,
+}
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
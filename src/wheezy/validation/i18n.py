@@ -1,3 +1,10 @@
+from gettext import NullTranslations
+from threading import Lock
+from weakref import WeakKeyDictionary, ref
+
+null_translations = NullTranslations()
+
+
 def thousands_separator(gettext):
     # thousands separator
     return gettext(",")
@@ -43,3 +50,67 @@ def fallback_datetime_input_formats(gettext):
         "%Y-%m-%d %H:%M|%Y-%m-%d %H:%M:%S|%m/%d/%y %H:%M|"
         "%m/%d/%y %H:%M:%S"
     )
+
+
+def cached_gettext(translations):
+    """Returns `translations` gettext function that memoizes message
+    lookups. The function is shared by all callers of the same
+    `translations` object, so it is cheap to call it per request.
+
+    Up to `gettext_cache_max_size` messages are memoized per
+    `translations` object. The function refers to `translations`
+    weakly, so the memoized lookups are discarded together with the
+    `translations` object.
+    """
+    try:
+        return gettext_cache[translations]
+    except KeyError:
+        pass
+    except TypeError:  # pragma: nocover
+        # not weak referenceable
+        return translations.gettext
+    translations_ref = ref(translations)
+    cache = {}
+
+    def cached(message):
+        try:
+            return cache[message]
+        except KeyError:
+            translations = translations_ref()
+            if translations is None:  # pragma: nocover
+                return message
+            if len(cache) >= gettext_cache_max_size:
+                cache.clear()
+            cache[message] = translated = translations.gettext(message)
+            return translated
+
+    with gettext_cache_lock:
+        return gettext_cache.setdefault(translations, cached)
+
+
+def resolve_gettext(translations=None, gettext=None):
+    """Returns `gettext` unless it is `None`, otherwise memoized
+    gettext function of `translations` (see `cached_gettext`) or of
+    null translations if `translations` is `None`.
+    """
+    if gettext is None:
+        if translations is None:
+            return null_translations.gettext
+        return cached_gettext(translations)
+    return gettext
+
+
+def clear_gettext_cache():
+    """Clears memoized message lookups, e.g. once a fallback is added
+    to translations. Value providers bound to locales are rebuilt as
+    well, see `wheezy.validation.model.locale_value_providers`.
+    """
+    with gettext_cache_lock:
+        gettext_cache.clear()
+
+
+# region: internal details
+
+gettext_cache = WeakKeyDictionary()
+gettext_cache_lock = Lock()
+gettext_cache_max_size = 1000
@@ -0,0 +1,254 @@
+from wheezy.validation.comp import path_value, ref_getter
+from wheezy.validation.i18n import resolve_gettext
+from wheezy.validation.rules import (
+    AdapterRule,
+    AndRule,
+    CachedRule,
+    CompareRule,
+    IgnoreRule,
+    IteratorRule,
+    LengthRule,
+    MissingRule,
+    NotNoneRule,
+    OneOfRule,
+    OrRule,
+    RangeRule,
+    RegexRule,
+    RelativeDeltaRule,
+    RequiredRule,
+    ValuePredicateRule,
+)
+from wheezy.validation.validator import Validator
+
+
+class IncrementalValidator(object):
+    """Validates the same model again after changes, re-running rules
+    of affected fields only and merging their outcome into results of
+    previous validation.
+
+    A field is affected if it is changed, the comparand of its
+    `compare` rule is changed or it has a rule that depends on the
+    whole model, e.g. `predicate` or a custom rule. Nested validators
+    are validated incrementally as well.
+
+    Example::
+
+        v = IncrementalValidator(user_validator)
+        errors = {}
+        v.validate(user, errors)
+        user.name = "john"
+        v.validate(user, errors, changed=["name"])
+        # or let it track changes itself
+        v.validate(user, errors)
+    """
+
+    def __init__(self, validator, stop=True, translations=None, gettext=None):
+        self.validator = validator
+        self.stop = stop
+        gettext = resolve_gettext(translations, gettext)
+        self.gettext = gettext
+        dependents = {}
+        paths = {}
+        model_dependent = []
+        for name, rules in validator.rules:
+            depends_on = dependencies(rules)
+            if depends_on is None:
+                model_dependent.append(name)
+                continue
+            depends_on.add(name)
+            for d in depends_on:
+                if "." in d:
+                    paths[d] = tuple(d.split("."))
+                    d = d.split(".", 1)[0]
+                dependents.setdefault(d, set()).add(name)
+        self.dependents = dependents
+        # dotted comparands, snapshot by path
+        self.paths = paths
+        self.model_dependent = frozenset(model_dependent)
+        self.inner = dict(
+            [
+                (name, IncrementalValidator(inner, stop, None, gettext))
+                for name, inner in validator.inner
+                if isinstance(inner, Validator)
+            ]
+        )
+        self.snapshot = None
+        self.failed = set()
+        self.keys = {}
+
+    def reset(self):
+        """Discards the state of previous validation, the next one
+        validates all fields.
+        """
+        self.snapshot = None
+        self.failed = set()
+        self.keys = {}
+        for inner in self.inner.values():
+            inner.reset()
+
+    def validate(self, model, results, changed=None):
+        """Validates `model` with results of validation merged into
+        `results` of previous validation. The `changed` is an iterable
+        of attribute names changed since then, a nested attribute is
+        addressed by dotted name, e.g. `user.name`. If `changed` is
+        `None` the changes are detected by comparing model attributes
+        with the values seen by previous validation.
+
+        Returns `True` if the model passes all rules.
+        """
+        validator = self.validator
+        getter = ref_getter(model)
+        snapshot = self.snapshot
+        tracked = changed is None
+        if snapshot is None:
+            affected = None
+            inner_changed = {}
+        else:
+            if tracked:
+                changed = self.changes(model, getter)
+            affected, inner_changed = self.affected(changed, tracked)
+        stop = self.stop
+        gettext = self.gettext
+        failed = self.failed
+        for name, rules in validator.rules:
+            if affected is not None and name not in affected:
+                continue
+            result = []
+            succeed = validate_rules(
+                rules, getter(model, name), name, model, result, stop, gettext
+            )
+            results.pop(name, None)
+            if result:
+                results[name] = result
+            if succeed:
+                failed.discard(name)
+            else:
+                failed.add(name)
+        keys = self.keys
+        for name, inner in validator.inner:
+            value = getter(model, name)
+            incremental = self.inner.get(name)
+            if incremental is not None:
+                if snapshot is not None and value is not snapshot[name]:
+                    incremental.reset()
+                succeed = incremental.validate(
+                    value, results, inner_changed.get(name)
+                )
+            elif affected is None or tracked or name in affected:
+                for key in keys.get(name, ()):
+                    results.pop(key, None)
+                before = set(results)
+                succeed = inner.validate(value, results, stop, None, gettext)
+                keys[name] = [key for key in results if key not in before]
+            else:
+                continue
+            if succeed:
+                failed.discard(name)
+            else:
+                failed.add(name)
+        self.snapshot = self.take_snapshot(model, getter)
+        return not failed
+
+    def affected(self, changed, tracked):
+        """Returns names of fields affected by `changed` attributes and
+        a dict of changed attributes per nested validator.
+        """
+        affected = set()
+        inner_changed = dict(
+            [(name, None if tracked else set()) for name in self.inner]
+        )
+        dependents = self.dependents
+        for name in changed:
+            head, sep, tail = name.partition(".")
+            if head in dependents:
+                affected.update(dependents[head])
+            if head not in inner_changed:
+                affected.add(head)
+            elif not tail:
+                inner_changed[head] = None
+            elif inner_changed[head] is not None:
+                inner_changed[head].add(tail)
+        if changed or tracked:
+            affected.update(self.model_dependent)
+        return affected, inner_changed
+
+    def changes(self, model, getter):
+        """Returns names of attributes that differ from the values seen
+        by previous validation.
+        """
+        inner = self.inner
+        paths = self.paths
+        changed = []
+        for name, value in self.snapshot.items():
+            if name in inner:
+                continue
+            if name in paths:
+                current = path_value(model, paths[name])
+            else:
+                current = getter(model, name)
+            if current != value:
+                changed.append(name)
+        return changed
+
+    def take_snapshot(self, model, getter):
+        names = set(self.dependents)
+        names.update(self.model_dependent)
+        inner = self.inner
+        names.update([name for name, v in self.validator.inner])
+        snapshot = {}
+        for name in names:
+            value = getter(model, name)
+            t = type(value)
+            if (t is list or t is dict or t is set) and name not in inner:
+                value = t(value)
+            snapshot[name] = value
+        for path, names in self.paths.items():
+            snapshot[path] = path_value(model, names)
+        return snapshot
+
+
+# region: internal details
+
+value_rules = (
+    IgnoreRule,
+    LengthRule,
+    MissingRule,
+    NotNoneRule,
+    OneOfRule,
+    RangeRule,
+    RegexRule,
+    RelativeDeltaRule,
+    RequiredRule,
+    ValuePredicateRule,
+)
+
+
+def validate_rules(rules, value, name, model, result, stop, gettext):
+    succeed = True
+    for rule in rules:
+        if not rule.validate(value, name, model, result, gettext):
+            succeed = False
+            if stop:
+                break
+    return succeed
+
+
+def dependencies(rules):
+    """Returns a set of names of other attributes `rules` depend on,
+    dotted for nested ones, or `None` if any rule depends on the whole
+    model.
+    """
+    depends_on = set()
+    rules = list(rules)
+    while rules:
+        rule = rules.pop()
+        if isinstance(rule, CompareRule):
+            if hasattr(rule, "comparand"):
+                depends_on.add(rule.comparand)
+        elif isinstance(rule, (AndRule, OrRule, IteratorRule)):
+            rules.extend(rule.rules)
+        elif isinstance(rule, (AdapterRule, CachedRule)):
+            rules.append(rule.rule)
+        elif not isinstance(rule, value_rules):
+            return None
+    return depends_on
@@ -0,0 +1,183 @@
+from threading import Lock
+from time import perf_counter
+
+from wheezy.validation.validator import (
+    CollectionValidator,
+    OptionalValidator,
+    PathValidator,
+    Validator,
+)
+
+
+class Instrumentation(object):
+    """Collects call count, failure count and cumulative time of each
+    rule per validator and field. Rules report every `sample`-th call
+    while `enabled`. Override `record` to forward observations to
+    a metrics system.
+
+    Example::
+
+        instrumentation = Instrumentation(sample=100)
+        user_validator = instrumentation.instrument(user_validator, "user")
+        ...
+        for key, calls, failures, elapsed in instrumentation.report():
+            ...
+    """
+
+    def __init__(self, sample=1, enabled=True):
+        self.sample = sample
+        self.enabled = enabled
+        self.stats = {}
+        self.lock = Lock()
+
+    def instrument(self, validator, name="validator"):
+        """Returns a copy of `validator` with rules that report to this
+        instrumentation, nested validators are instrumented as well
+        with `name` qualified by attribute name, e.g. `order.lines[]`
+        for items of `CollectionValidator`. Rules of a dotted name are
+        reported by the dotted name as a field.
+
+        Subclasses of `Validator`, e.g. `AdaptiveValidator`, and custom
+        nested validators are returned as is, not instrumented. Items
+        validated by a `ParallelValidator` in worker processes are not
+        reported.
+        """
+        if type(validator) is not Validator:
+            return validator
+        rules = [
+            (field, self.instrument_rules(field_rules, name, field))
+            for field, field_rules in validator.rules
+        ]
+        inner = [
+            (field, self.instrument_inner(inner_validator, name, field))
+            for field, inner_validator in validator.inner
+        ]
+        instrumented = Validator({})
+        instrumented.rules = tuple(rules)
+        instrumented.inner = tuple(inner)
+        return instrumented
+
+    def instrument_rules(self, rules, name, field):
+        """Returns a tuple of `rules` of `field` that report to this
+        instrumentation.
+        """
+        return tuple(
+            [
+                InstrumentedRule(rule, self, (name, field, i, rule_name(rule)))
+                for i, rule in enumerate(rules)
+            ]
+        )
+
+    def instrument_inner(self, validator, name, field):
+        """Returns nested `validator` of `field` instrumented, see
+        `instrument`.
+        """
+        t = type(validator)
+        if t is Validator:
+            return self.instrument(validator, name + "." + field)
+        if t is PathValidator:
+            return PathValidator(
+                validator.name,
+                self.instrument_rules(validator.rules, name, validator.name),
+            )
+        if t is OptionalValidator:
+            return OptionalValidator(
+                self.instrument_inner(validator.validator, name, field)
+            )
+        if t is CollectionValidator:
+            return CollectionValidator(
+                self.instrument(
+                    validator.validator, name + "." + field + "[]"
+                ),
+                validator.chunk_size,
+                validator.max_failures,
+                validator.parallel,
+                validator.name,
+            )
+        return validator
+
+    def record(self, key, elapsed, succeed):
+        """Records a call of rule identified by `key`, a tuple of
+        validator name, field name, rule index and rule name.
+        """
+        with self.lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                self.stats[key] = stats = [0, 0, 0.0]
+            stats[0] += 1
+            if not succeed:
+                stats[1] += 1
+            stats[2] += elapsed
+
+    def report(self):
+        """Returns a list of tuples: key, calls, failures and elapsed
+        time, estimated by `sample` and sorted by elapsed time, the
+        slowest rules first.
+        """
+        sample = self.sample
+        with self.lock:
+            report = [
+                (key, calls * sample, failures * sample, elapsed * sample)
+                for key, (calls, failures, elapsed) in self.stats.items()
+            ]
+        report.sort(key=lambda r: r[3], reverse=True)
+        return report
+
+    def report_fields(self):
+        """Returns report aggregated per validator and field."""
+        totals = {}
+        for key, calls, failures, elapsed in self.report():
+            key = key[:2]
+            t = totals.get(key)
+            if t is None:
+                totals[key] = [calls, failures, elapsed]
+            else:
+                t[0] = max(t[0], calls)
+                t[1] += failures
+                t[2] += elapsed
+        report = [(key, c, f, e) for key, (c, f, e) in totals.items()]
+        report.sort(key=lambda r: r[3], reverse=True)
+        return report
+
+    def reset(self):
+        """Discards observations collected."""
+        with self.lock:
+            self.stats = {}
+
+
+class InstrumentedRule(object):
+    """Reports calls of `rule` to `instrumentation`."""
+
+    __slots__ = ("rule", "instrumentation", "key", "calls")
+
+    def __init__(self, rule, instrumentation, key):
+        self.rule = rule
+        self.instrumentation = instrumentation
+        self.key = key
+        self.calls = 0
+
+    def validate(self, value, name, model, result, gettext):
+        instrumentation = self.instrumentation
+        if not instrumentation.enabled:
+            return self.rule.validate(value, name, model, result, gettext)
+        self.calls = calls = self.calls + 1
+        if calls % instrumentation.sample:
+            return self.rule.validate(value, name, model, result, gettext)
+        start = perf_counter()
+        succeed = self.rule.validate(value, name, model, result, gettext)
+        instrumentation.record(self.key, perf_counter() - start, succeed)
+        return succeed
+
+
+# region: internal details
+
+
+def rule_name(rule):
+    """Returns name of rule class qualified by the validation strategy
+    selected, e.g. `LengthRule.check_min`.
+    """
+    name = type(rule).__name__
+    strategy = getattr(rule.validate, "__name__", "validate")
+    if strategy != "validate":
+        name += "." + strategy
+    return name
@@ -0,0 +1,185 @@
+from wheezy.validation.i18n import resolve_gettext
+
+
+class LazyMessage(object):
+    """Error message that keeps message template and its arguments,
+    translation and formatting are deferred until it is converted
+    to ``str``.
+    """
+
+    __slots__ = ("template", "gettext", "args")
+
+    def __init__(self, template, gettext, args=None):
+        self.template = template
+        self.gettext = gettext
+        self.args = args
+
+    def __mod__(self, args):
+        """Keeps format arguments of message template."""
+        self.args = args
+        return self
+
+    def __str__(self):
+        message = self.gettext(self.template)
+        if self.args is not None:
+            message = message % self.args
+        return message
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, (str, LazyMessage)):
+            return NotImplemented
+        return str(self) == str(other)
+
+    def __ne__(self, other):
+        if not isinstance(other, (str, LazyMessage)):
+            return NotImplemented
+        return str(self) != str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __reduce__(self):
+        return str, (str(self),)
+
+
+def lazy_gettext(translations=None):
+    """Returns gettext function that produces lazy messages, use it
+    with `Validator.validate`::
+
+        errors = {}
+        validator.validate(model, errors, gettext=lazy_gettext(t))
+
+    The messages are translated with `translations` once converted to
+    ``str``, e.g. ``json.dumps(errors, default=str)``.
+    """
+    gettext = resolve_gettext(translations)
+
+    def lazy(message):
+        return LazyMessage(message, gettext)
+
+    return lazy
+
+
+class MessageTemplate(str):
+    """Message template that carries a stable error `code`, rules
+    keep their message templates this way. A template that is not
+    ``str`` is returned as is.
+    """
+
+    def __new__(cls, code, template):
+        if not isinstance(template, str):
+            return template
+        self = str.__new__(cls, template)
+        self.code = code
+        return self
+
+    def __reduce__(self):
+        return MessageTemplate, (self.code, str(self))
+
+
+class ErrorCode(object):
+    """Error reported as a stable code and format arguments of the
+    message template, the message is produced on demand only. It is
+    iterable as a pair of code and arguments, so it is serialized to
+    JSON with ``json.dumps(errors, default=list)``.
+    """
+
+    __slots__ = ("code", "template", "args")
+
+    def __init__(self, code, template, args=None):
+        self.code = code
+        self.template = template
+        self.args = args
+
+    def __mod__(self, args):
+        """Keeps format arguments of message template."""
+        self.args = args
+        return self
+
+    def __iter__(self):
+        return iter((self.code, self.args))
+
+    def __eq__(self, other):
+        if not isinstance(other, (ErrorCode, tuple, list)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        if not isinstance(other, (ErrorCode, tuple, list)):
+            return NotImplemented
+        return tuple(self) != tuple(other)
+
+    def __hash__(self):
+        # the same as of an equal tuple, if arguments are hashable
+        try:
+            return hash((self.code, self.args))
+        except TypeError:
+            return hash(self.code)
+
+    def __repr__(self):
+        return "ErrorCode(%r, %r)" % (self.code, self.args)
+
+    def __reduce__(self):
+        return ErrorCode, (self.code, self.template, self.args)
+
+    def translate(self, gettext):
+        """Returns error message translated with `gettext`."""
+        message = gettext(self.template)
+        if self.args is not None:
+            message = message % self.args
+        return message
+
+
+def code_gettext(message):
+    """Returns error code for message template, use it with
+    `Validator.validate`::
+
+        errors = {}
+        validator.validate(model, errors, gettext=code_gettext)
+        # {'username': [ErrorCode('length.max', {'max': 10})]}
+
+    A template without code (e.g. of a custom rule) is used as code.
+    """
+    return ErrorCode(getattr(message, "code", message), message)
+
+
+def translate_errors(errors, translations=None, gettext=None):
+    """Returns a copy of `errors` with error codes translated to
+    messages, other messages are left as is.
+    """
+    gettext = resolve_gettext(translations, gettext)
+    return dict(
+        [
+            (
+                name,
+                [
+                    e.translate(gettext) if isinstance(e, ErrorCode) else e
+                    for e in result
+                ],
+            )
+            for name, result in errors.items()
+        ]
+    )
+
+
+class NullResult(list):
+    """Result list that discards error messages."""
+
+    __slots__ = ()
+
+    def append(self, message):
+        pass
+
+    def extend(self, messages):
+        pass
+
+
+def null_gettext(message):
+    """Returns `message` as is, no translation is made."""
+    return message
+
+
+null_result = NullResult()
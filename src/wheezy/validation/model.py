@@ -1,9 +1,11 @@
 from datetime import date, datetime, time
 from decimal import Decimal
-from gettext import NullTranslations
-from time import strptime
+from threading import Lock
+from time import strptime as time_strptime
+from weakref import WeakKeyDictionary
 
 from wheezy.validation.i18n import (
+    cached_gettext,
     decimal_separator,
     default_date_input_format,
     default_datetime_input_format,
@@ -11,86 +13,485 @@ from wheezy.validation.i18n import (
     fallback_date_input_formats,
     fallback_datetime_input_formats,
     fallback_time_input_formats,
+    null_translations,
+    resolve_gettext,
     thousands_separator,
 )
 from wheezy.validation.patches import patch_strptime_cache_size
 
-if not patch_strptime_cache_size():  # pragma: nocover
-    from warnings import warn
-
-    warn("Failed to patch _strptime._CACHE_MAX_SIZE")
-    del warn
-del patch_strptime_cache_size
-
-null_translations = NullTranslations()
-
 
 def try_update_model(model, values, results, translations=None):
     """Try update `model` with `values` (a dict of lists or strings),
     any errors encountered put into `results` and use `translations`
     for i18n.
+
+    Attribute names of a model class and value providers of their
+    types are computed once per class, see `clear_binding_plans`.
+    Values are converted by `value_providers` bound to locale of
+    `translations`, see `locale_value_providers`.
     """
-    if translations is None:
-        translations = null_translations
-    gettext = translations.gettext
+    gettext = resolve_gettext(translations)
+    providers = locale_value_providers(translations)
     if hasattr(model, "__iter__"):
-        attribute_names = model
-        model_type = type(model)
-        getter = model_type.__getitem__
-        setter = model_type.__setitem__
+        return update_items(model, values, results, gettext, providers)
+    plan = binding_plan(model)
+    if plan is None:
+        attributes = [(name, None, None) for name in attribute_names(model)]
     else:
-        attribute_names = list(model.__dict__)
-        attribute_names.extend(
-            [name for name in model.__class__.__dict__ if name[:1] != "_"]
+        attributes = plan[1]
+    return update_attributes(
+        model, attributes, values, results, gettext, providers
+    )
+
+
+def try_update_models(model_factory, rows, header=None, translations=None):
+    """Yields a tuple ``(model, errors)`` per row of `rows`, the
+    `model` is created by `model_factory` and updated with the row the
+    same way `try_update_model` does. A row is a dict of values or,
+    if `header` (a sequence of names) is given, a sequence of values
+    in the header order. Rows are read as results are consumed.
+
+    Translations, value providers and attributes bound from the
+    `header` are resolved once, not per row.
+
+    Example::
+
+        reader = csv.reader(f)
+        for model, errors in try_update_models(
+                Credential, reader, next(reader)):
+            pass
+    """
+    gettext = resolve_gettext(translations)
+    providers = locale_value_providers(translations)
+    if header is not None:
+        names = frozenset(header)
+    plan = attributes = None
+    for row in rows:
+        if header is not None:
+            row = dict(zip(header, row))
+        model = model_factory()
+        errors = {}
+        if hasattr(model, "__iter__"):
+            update_items(model, row, errors, gettext, providers)
+            yield model, errors
+            continue
+        p = binding_plan(model)
+        if p is None:
+            update_attributes(
+                model,
+                [(name, None, None) for name in attribute_names(model)],
+                row,
+                errors,
+                gettext,
+                providers,
+            )
+        else:
+            if p is not plan:
+                plan = p
+                attributes = p[1]
+                if header is not None:
+                    attributes = tuple(a for a in attributes if a[0] in names)
+            update_attributes(
+                model, attributes, row, errors, gettext, providers
+            )
+        yield model, errors
+
+
+def clear_binding_plans(model_class=None):
+    """Discards binding plans of `model_class` or all if `None`, e.g.
+    after class attributes are changed. All discards value providers
+    bound to locales as well.
+    """
+    with binding_plans_lock:
+        if model_class is None:
+            binding_plans.clear()
+        else:
+            binding_plans.pop(model_class, None)
+    if model_class is None:
+        with locale_providers_lock:
+            locale_providers.clear()
+
+
+# region: internal details
+
+# A binding plan of model class: a set of attribute names and a tuple
+# of (name, attribute type, value provider name).
+binding_plans = WeakKeyDictionary()
+binding_plans_lock = Lock()
+missing = object()
+
+
+def attribute_names(model):
+    names = list(model.__dict__)
+    names.extend(
+        [
+            name
+            for name in model.__class__.__dict__
+            if name[:1] != "_" and name not in model.__dict__
+        ]
+    )
+    return names
+
+
+def binding_plan(model):
+    """Returns a binding plan of `model` class, or `None` if `model`
+    has instance attributes the plan is not made for.
+    """
+    model_class = model.__class__
+    try:
+        plan = binding_plans[model_class]
+    except KeyError:
+        attributes = []
+        instance_attributes = model.__dict__
+        class_attributes = model_class.__dict__
+        for name in attribute_names(model):
+            if name in instance_attributes:
+                attr = instance_attributes[name]
+            else:
+                attr = class_attributes[name]
+                if hasattr(type(attr), "__get__"):
+                    # a descriptor, e.g. property, is read on update
+                    attributes.append((name, None, None))
+                    continue
+            attr_type = type(attr)
+            if hasattr(attr_type, "__setitem__"):
+                attr_type = list
+            attributes.append((name, attr_type, attr_type.__name__))
+        plan = (
+            frozenset(name for name, _, _ in attributes),
+            tuple(attributes),
         )
-        getter = getattr
-        setter = setattr
+        with binding_plans_lock:
+            binding_plans[model_class] = plan
+    if not plan[0].issuperset(model.__dict__):
+        return None
+    return plan
+
+
+def update_items(model, values, results, gettext, providers):
+    model_type = type(model)
+    getter = model_type.__getitem__
+    setter = model_type.__setitem__
     succeed = True
-    for name in attribute_names:
+    for name in model:
+        if name in values:
+            succeed &= update_attribute(
+                model,
+                name,
+                getter(model, name),
+                values[name],
+                setter,
+                results,
+                gettext,
+                providers,
+            )
+    return succeed
+
+
+def update_attributes(model, attributes, values, results, gettext, providers):
+    """Updates `model` attributes by a binding plan, see
+    `binding_plan`. An attribute of type the plan is not made for is
+    updated by `update_attribute`, one the `model` does not have is
+    skipped.
+    """
+    succeed = True
+    for name, attr_type, provider_name in attributes:
         if name not in values:
             continue
+        attr = getattr(model, name, missing)
+        if attr is missing:
+            continue
         value = values[name]
-        attr = getter(model, name)
-        # Check if we have a deal with list like attribute
-        if hasattr(attr, "__setitem__"):
-            # Guess type of list by checking the first item,
-            # fallback to str provider that leaves value unchanged.
-            if attr:
-                provider_name = type(attr[0]).__name__
-                if provider_name in value_providers:
-                    value_provider = value_providers[provider_name]
-                else:  # pragma: nocover
-                    continue
-            else:
-                value_provider = value_providers["str"]
-            items = []
+        if type(attr) is not attr_type or attr_type is list:
+            succeed &= update_attribute(
+                model, name, attr, value, setattr, results, gettext, providers
+            )
+        elif provider_name in providers:
+            value_provider = providers[provider_name]
+            if isinstance(value, list):
+                value = value and value[-1] or ""
             try:
-                for item in value:
-                    items.append(value_provider(item, gettext))
-                attr[:] = items
+                setattr(model, name, value_provider(value, gettext))
             except (ArithmeticError, ValueError):
-                results[name] = [
-                    gettext("Multiple input was not in a correct format.")
-                ]
+                results[name] = [gettext("Input was not in a correct format.")]
                 succeed = False
-        else:  # A simple value attribute
-            provider_name = type(attr).__name__
-            if provider_name in value_providers:
-                value_provider = value_providers[provider_name]
-                if isinstance(value, list):
-                    value = value and value[-1] or ""
-                try:
-                    value = value_provider(value, gettext)
-                    setter(model, name, value)
-                except (ArithmeticError, ValueError):
-                    results[name] = [
-                        gettext("Input was not in a correct format.")
-                    ]
-                    succeed = False
     return succeed
 
 
-# region: internal details
+def update_attribute(
+    model, name, attr, value, setter, results, gettext, providers
+):
+    """Updates attribute `name` of `model`, its value provider is
+    selected by type of current value `attr`.
+    """
+    # Check if we have a deal with list like attribute
+    if hasattr(attr, "__setitem__"):
+        # Guess type of list by checking the first item,
+        # fallback to str provider that leaves value unchanged.
+        if attr:
+            provider_name = type(attr[0]).__name__
+            if provider_name in providers:
+                value_provider = providers[provider_name]
+            else:  # pragma: nocover
+                return True
+        else:
+            value_provider = providers["str"]
+        items = []
+        try:
+            for item in value:
+                items.append(value_provider(item, gettext))
+            attr[:] = items
+        except (ArithmeticError, ValueError):
+            results[name] = [
+                gettext("Multiple input was not in a correct format.")
+            ]
+            return False
+    else:  # A simple value attribute
+        provider_name = type(attr).__name__
+        if provider_name in providers:
+            value_provider = providers[provider_name]
+            if isinstance(value, list):
+                value = value and value[-1] or ""
+            try:
+                value = value_provider(value, gettext)
+                setter(model, name, value)
+            except (ArithmeticError, ValueError):
+                results[name] = [gettext("Input was not in a correct format.")]
+                return False
+    return True
+
+
+def strptime(value, fmt):
+    """Patches strptime cache size on first call, see `patch_strptime`."""
+    patch_strptime()
+    return strptime(value, fmt)
+
+
+def patch_strptime():
+    """Patches strptime regex cache size and replaces `strptime` of
+    this module by ``time.strptime``. It is deferred until the first
+    date or time input is parsed since it imports `_strptime`.
+    """
+    global strptime
+    if strptime is time_strptime:
+        return
+    if not patch_strptime_cache_size():  # pragma: nocover
+        from warnings import warn
+
+        warn("Failed to patch _strptime._CACHE_MAX_SIZE")
+    strptime = time_strptime
+
+
+def input_parser(fmt):
+    """Returns a function ``parse(value)`` that returns a tuple of
+    ``(year, month, day, hour, minute, second)`` for `value` in format
+    `fmt` or raises ``ValueError``. Directives ``%Y %m %d %y %H %M %S``
+    are matched the way ``time.strptime`` does and converted to integers
+    directly, a format with any other directive is parsed by strptime.
+    The function is cached per format.
+    """
+    try:
+        return parsers[fmt]
+    except KeyError:
+        pass
+    parse = compile_input_parser(fmt)
+    if parse is None:
+
+        def parse(value):
+            return strptime(value, fmt)[:6]
+
+    return parsers.setdefault(fmt, parse)
+
+
+def input_parsers(formats):
+    """Returns a tuple of parsers for `formats` separated by ``|``."""
+    try:
+        return formats_parsers[formats]
+    except KeyError:
+        return formats_parsers.setdefault(
+            formats, tuple([input_parser(fmt) for fmt in formats.split("|")])
+        )
+
+
+def input_matcher(formats):
+    """Returns a function ``parse(value, convert)`` that returns
+    ``convert(result)`` for `result` of the first of `formats`
+    (separated by ``|``) that `value` matches and `convert` accepts,
+    see `input_parser`. Formats are compiled into a single regex, so
+    the matching format is found by one scan. Formats with a directive
+    that is not supported are tried in turn. The function is cached per
+    formats.
+    """
+    try:
+        return matchers[formats]
+    except KeyError:
+        pass
+    parse = compile_input_matcher(formats)
+    if parse is None:
+        parsers = input_parsers(formats)
+
+        def parse(value, convert):
+            return next_input(parsers, value, convert)
+
+    return matchers.setdefault(formats, parse)
+
+
+parsers = {}
+formats_parsers = {}
+matchers = {}
+
+# directive => (pattern as of _strptime, index in result tuple)
+input_directives = {
+    "Y": (r"(\d\d\d\d)", 0),
+    "m": (r"(1[0-2]|0[1-9]|[1-9])", 1),
+    "d": (r"(3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])", 2),
+    "y": (r"(\d\d)", 0),
+    "H": (r"(2[0-3]|[0-1]\d|\d)", 3),
+    "M": (r"([0-5]\d|\d)", 4),
+    "S": (r"(6[0-1]|[0-5]\d|\d)", 5),
+}
+
+
+def input_pattern(fmt):
+    """Returns a tuple of regex pattern and fields of `fmt` or `None` if
+    the format has a directive that is not supported.
+    """
+    from re import escape
+
+    pattern = []
+    directives = []
+    indexes = []
+    i = 0
+    n = len(fmt)
+    while i < n:
+        c = fmt[i]
+        if c == "%":
+            d = i + 1 < n and fmt[i + 1] or ""
+            if d == "%":
+                pattern.append("%")
+            elif d in input_directives:
+                p, index = input_directives[d]
+                if index in indexes:
+                    return None
+                pattern.append(p)
+                directives.append(d)
+                indexes.append(index)
+            else:
+                return None
+            i += 2
+        elif c.isspace():
+            while i < n and fmt[i].isspace():
+                i += 1
+            pattern.append(r"\s+")
+        else:
+            pattern.append(escape(c))
+            i += 1
+    fields = tuple(zip(indexes, [d == "y" for d in directives]))
+    return "".join(pattern), (fields, 0 in indexes)
+
+
+def input_result(groups, fields):
+    fields, has_year = fields
+    result = [1900, 1, 1, 0, 0, 0]
+    for (index, pivot), group in zip(fields, groups):
+        group = int(group)
+        if pivot:
+            # the same pivot year as of strptime
+            group += group <= 68 and 2000 or 1900
+        result[index] = group
+    if result[2] > 28:
+        # day out of range for month raises ValueError, February 29
+        # is valid if year is not given, just like strptime does
+        date(has_year and result[0] or 1904, result[1], result[2])
+    return result
+
+
+def compile_input_parser(fmt):
+    """Returns a parser of `fmt` or `None` if the format has a directive
+    that is not supported.
+    """
+    from re import IGNORECASE, compile
+
+    p = input_pattern(fmt)
+    if p is None:
+        return None
+    pattern, fields = p
+    match = compile(pattern, IGNORECASE).match
+
+    def parse(value):
+        m = match(value)
+        if m is None or m.end() != len(value):
+            raise ValueError(
+                "time data %r does not match format %r" % (value, fmt)
+            )
+        return input_result(m.groups(), fields)
+
+    return parse
+
+
+def compile_input_matcher(formats):
+    """Returns a matcher of `formats` that scans input once by a regex
+    of alternatives, one per format, or `None` if any format has a
+    directive that is not supported.
+    """
+    from re import IGNORECASE, compile
+
+    patterns = []
+    # group index of alternative => (groups start, groups end, fields,
+    # parsers of the rest formats)
+    alternatives = {}
+    parsers = input_parsers(formats)
+    group = 1
+    for k, fmt in enumerate(formats.split("|"), 1):
+        p = input_pattern(fmt)
+        if p is None:
+            return None
+        pattern, fields = p
+        patterns.append("(%s)\\Z" % pattern)
+        end = group + len(fields[0])
+        alternatives[group] = (group, end, fields, parsers[k:])
+        group = end + 1
+    try:
+        match = compile("|".join(patterns), IGNORECASE).match
+    except Exception:  # pragma: nocover
+        return None
+
+    def parse(value, convert):
+        m = match(value)
+        if m is not None:
+            start, end, fields, rest = alternatives[m.lastindex]
+            try:
+                return convert(input_result(m.groups()[start:end], fields))
+            except ValueError:
+                # the value is not valid for the format, e.g. out of range
+                return next_input(rest, value, convert)
+        raise ValueError(
+            "time data %r does not match formats %r" % (value, formats)
+        )
+
+    return parse
+
+
+def to_date(result):
+    return date(*result[:3])
+
+
+def to_time(result):
+    return time(*result[3:6])
+
+
+def to_datetime(result):
+    return datetime(*result)
+
+
+def next_input(parsers, value, convert):
+    for parse in parsers:
+        try:
+            return convert(parse(value))
+        except ValueError:
+            continue
+    raise ValueError("time data %r does not match any format" % value)
+
 
 # value_provider => lambda value, gettext: parsed_value
 
@@ -121,16 +522,7 @@ def str_value_provider(value, gettext):
 
 def int_value_provider(value, gettext):
     """Converts ``value`` to ``int``."""
-    if value is None or type(value) is int:
-        return value
-    value = str(value).strip()
-    if value:
-        s = thousands_separator(gettext)
-        if s in value:
-            value = value.replace(s, "")
-        return int(value)
-    else:
-        return None
+    return parse_int(value, thousands_separator(gettext))
 
 
 decimal_zero = Decimal(0)
@@ -139,21 +531,9 @@ decimal_zero_values = ["0", "0.0", "0.00"]
 
 def decimal_value_provider(value, gettext):
     """Converts ``value`` to ``Decimal``."""
-    if value is None:
-        return None
-    value = str(value).strip()
-    if value:
-        s = thousands_separator(gettext)
-        if s in value:
-            value = value.replace(s, "")
-        s = decimal_separator(gettext)
-        if s in value:
-            value = value.replace(s, ".", 1)
-        if value in decimal_zero_values:
-            return decimal_zero
-        return Decimal(value)
-    else:
-        return None
+    return parse_decimal(
+        value, thousands_separator(gettext), decimal_separator(gettext)
+    )
 
 
 boolean_true_values = ["1", "True"]
@@ -169,94 +549,254 @@ def bool_value_provider(value, gettext):
 
 def float_value_provider(value, gettext):
     """Converts ``value`` to ``float``."""
+    return parse_float(
+        value, thousands_separator(gettext), decimal_separator(gettext)
+    )
+
+
+def date_value_provider(value, gettext):
+    """Converts ``value`` to ``datetime.date``."""
+    return parse_date(value, date_matcher(gettext))
+
+
+def time_value_provider(value, gettext):
+    """Converts ``value`` to ``datetime.time``."""
+    return parse_time(value, time_matcher(gettext))
+
+
+def datetime_value_provider(value, gettext):
+    """Converts ``value`` to ``datetime.datetime``."""
+    return parse_datetime(
+        value, datetime_matcher(gettext), date_matcher(gettext)
+    )
+
+
+def bind_value_providers(gettext, providers=None):
+    """Returns a copy of `providers` (defaults to `value_providers`)
+    with built-in providers bound to locale of `gettext`: thousands and
+    decimal separators and date and time input formats are resolved
+    once, not per value. Custom providers are copied as is.
+    """
+    if providers is None:
+        providers = value_providers
+    thousands = thousands_separator(gettext)
+    decimal = decimal_separator(gettext)
+    date_match = date_matcher(gettext)
+    time_match = time_matcher(gettext)
+    datetime_match = datetime_matcher(gettext)
+
+    def int_provider(value, gettext):
+        return parse_int(value, thousands)
+
+    def decimal_provider(value, gettext):
+        return parse_decimal(value, thousands, decimal)
+
+    def float_provider(value, gettext):
+        return parse_float(value, thousands, decimal)
+
+    def date_provider(value, gettext):
+        return parse_date(value, date_match)
+
+    def time_provider(value, gettext):
+        return parse_time(value, time_match)
+
+    def datetime_provider(value, gettext):
+        return parse_datetime(value, datetime_match, date_match)
+
+    bound = {
+        int_value_provider: int_provider,
+        decimal_value_provider: decimal_provider,
+        float_value_provider: float_provider,
+        date_value_provider: date_provider,
+        time_value_provider: time_provider,
+        datetime_value_provider: datetime_provider,
+    }
+    return {
+        name: bound.get(provider, provider)
+        for name, provider in providers.items()
+    }
+
+
+def locale_value_providers(translations=None):
+    """Returns `value_providers` bound to locale of `translations`, see
+    `bind_value_providers`. The result is cached per `translations`
+    object and rebuilt once `value_providers` is changed or the
+    memoized message lookups are cleared, see `clear_gettext_cache`.
+    """
+    if translations is None:
+        translations = null_translations
+    gettext = cached_gettext(translations)
+    try:
+        version, bound_gettext, providers = locale_providers[translations]
+        if version == value_providers.version and bound_gettext is gettext:
+            return providers
+    except KeyError:
+        pass
+    except TypeError:  # pragma: nocover
+        # not weak referenceable
+        return bind_value_providers(gettext)
+    version = value_providers.version
+    providers = bind_value_providers(gettext)
+    with locale_providers_lock:
+        locale_providers[translations] = version, gettext, providers
+    return providers
+
+
+class ValueProviders(dict):
+    """A dict of value providers by type name that counts changes in
+    `version`, so value providers bound to locales are rebuilt once a
+    provider is added, replaced or removed.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args, **kwargs):
+        super(ValueProviders, self).__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, name, provider):
+        super(ValueProviders, self).__setitem__(name, provider)
+        self.version += 1
+
+    def __delitem__(self, name):
+        super(ValueProviders, self).__delitem__(name)
+        self.version += 1
+
+    def clear(self):
+        super(ValueProviders, self).clear()
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super(ValueProviders, self).pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super(ValueProviders, self).popitem()
+
+    def setdefault(self, name, provider=None):
+        self.version += 1
+        return super(ValueProviders, self).setdefault(name, provider)
+
+    def update(self, *args, **kwargs):
+        super(ValueProviders, self).update(*args, **kwargs)
+        self.version += 1
+
+
+value_providers = ValueProviders(
+    {
+        "int": int_value_provider,
+        "Decimal": decimal_value_provider,
+        "bool": bool_value_provider,
+        "float": float_value_provider,
+        "date": date_value_provider,
+        "time": time_value_provider,
+        "datetime": datetime_value_provider,
+    }
+)
+
+value_providers["str"] = str_value_provider
+value_providers["bytes"] = bytes_value_provider
+
+locale_providers = WeakKeyDictionary()
+locale_providers_lock = Lock()
+
+
+def date_matcher(gettext):
+    return input_matcher(
+        default_date_input_format(gettext)
+        + "|"
+        + fallback_date_input_formats(gettext)
+    )
+
+
+def time_matcher(gettext):
+    return input_matcher(
+        default_time_input_format(gettext)
+        + "|"
+        + fallback_time_input_formats(gettext)
+    )
+
+
+def datetime_matcher(gettext):
+    return input_matcher(
+        default_datetime_input_format(gettext)
+        + "|"
+        + fallback_datetime_input_formats(gettext)
+    )
+
+
+def parse_int(value, thousands):
+    if value is None or type(value) is int:
+        return value
+    value = str(value).strip()
+    if value:
+        if thousands in value:
+            value = value.replace(thousands, "")
+        return int(value)
+    else:
+        return None
+
+
+def parse_decimal(value, thousands, decimal):
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value:
+        if thousands in value:
+            value = value.replace(thousands, "")
+        if decimal in value:
+            value = value.replace(decimal, ".", 1)
+        if value in decimal_zero_values:
+            return decimal_zero
+        return Decimal(value)
+    else:
+        return None
+
+
+def parse_float(value, thousands, decimal):
     if value is None or type(value) is float:
         return value
     value = str(value).strip()
     if value:
-        s = thousands_separator(gettext)
-        if s in value:
-            value = value.replace(s, "")
-        s = decimal_separator(gettext)
-        if s in value:
-            value = value.replace(s, ".", 1)
+        if thousands in value:
+            value = value.replace(thousands, "")
+        if decimal in value:
+            value = value.replace(decimal, ".", 1)
         return float(value)
     else:
         return None
 
 
-def date_value_provider(value, gettext):
-    """Converts ``value`` to ``datetime.date``."""
+def parse_date(value, match):
     if value is None:
         return None
     value = str(value).strip()
     if value:
-        try:
-            return date(
-                *strptime(value, default_date_input_format(gettext))[:3]
-            )
-        except ValueError:
-            for fmt in fallback_date_input_formats(gettext).split("|"):
-                try:
-                    return date(*strptime(value, fmt)[:3])
-                except ValueError:
-                    continue
-            raise ValueError()
+        return match(value, to_date)
     else:
         return None
 
 
-def time_value_provider(value, gettext):
-    """Converts ``value`` to ``datetime.time``."""
+def parse_time(value, match):
     if value is None:
         return None
     value = str(value).strip()
     if value:
-        try:
-            return time(
-                *strptime(value, default_time_input_format(gettext))[3:6]
-            )
-        except ValueError:
-            for fmt in fallback_time_input_formats(gettext).split("|"):
-                try:
-                    return time(*strptime(value, fmt)[3:6])
-                except ValueError:
-                    continue
-            raise ValueError()
+        return match(value, to_time)
     else:
         return None
 
 
-def datetime_value_provider(value, gettext):
-    """Converts ``value`` to ``datetime.datetime``."""
+def parse_datetime(value, match, date_match):
     if value is None:
         return None
     value = str(value).strip()
     if value:
         try:
-            return datetime(
-                *strptime(value, default_datetime_input_format(gettext))[:6]
-            )
+            return match(value, to_datetime)
         except ValueError:
-            for fmt in fallback_datetime_input_formats(gettext).split("|"):
-                try:
-                    return datetime(*strptime(value, fmt)[:6])
-                except ValueError:
-                    continue
-            value = date_value_provider(value, gettext)
+            value = date_match(value, to_date)
             return datetime(value.year, value.month, value.day)
     else:
         return None
-
-
-value_providers = {
-    "int": int_value_provider,
-    "Decimal": decimal_value_provider,
-    "bool": bool_value_provider,
-    "float": float_value_provider,
-    "date": date_value_provider,
-    "time": time_value_provider,
-    "datetime": datetime_value_provider,
-}
-
-value_providers["str"] = str_value_provider
-value_providers["bytes"] = bytes_value_provider
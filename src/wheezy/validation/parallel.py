@@ -0,0 +1,166 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from wheezy.validation.i18n import null_translations
+
+
+class ParallelValidator(object):
+    """Validates large sequences of models on a pool of worker
+    processes. The input is split into chunks of `chunk_size`
+    models, results are merged in order of models.
+
+    The `validator` and its message templates translated with
+    `translations` are sent to each worker process once, when the
+    pool starts. Rules must be picklable, e.g. no lambda predicates,
+    unless the pool uses the `fork` start method (see `mp_context`).
+    Messages of a custom rule that are not kept in its
+    `message_template` are not translated.
+
+    Example::
+
+        with ParallelValidator(user_validator, max_workers=4) as v:
+            errors = v.validate_many(users)
+    """
+
+    def __init__(
+        self,
+        validator,
+        translations=None,
+        stop=True,
+        chunk_size=10000,
+        max_workers=None,
+        mp_context=None,
+    ):
+        if translations is None:
+            translations = null_translations
+        self.validator = validator
+        self.translations = translations
+        self.stop = stop
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Shuts down worker processes, if any."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def validate_many(self, models, indices_only=False):
+        """Validates each model in `models` sequence, see
+        `Validator.validate_many` for the results returned.
+
+        Models that fit in a single chunk are validated inline.
+        """
+        size = len(models)
+        chunk_size = self.chunk_size
+        if size <= chunk_size or self.max_workers == 1:
+            return self.validator.validate_many(
+                models,
+                self.stop,
+                self.translations,
+                indices_only=indices_only,
+            )
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                self.max_workers,
+                self.mp_context,
+                initializer=init_worker,
+                initargs=(
+                    self.validator,
+                    translate_templates(
+                        self.validator, self.translations.gettext
+                    ),
+                    self.stop,
+                ),
+            )
+        offsets = range(0, size, chunk_size)
+        bounds = range(chunk_size, size + chunk_size, chunk_size)
+        chunks = self.executor.map(
+            validate_chunk,
+            [models[i:j] for i, j in zip(offsets, bounds)],
+            [indices_only] * len(offsets),
+        )
+        if indices_only:
+            failed = []
+            for offset, indices in zip(offsets, chunks):
+                failed.extend([offset + i for i in indices])
+            return failed
+        errors = {}
+        for offset, chunk_errors in zip(offsets, chunks):
+            for i, results in chunk_errors.items():
+                errors[offset + i] = results
+        return errors
+
+
+def validate_parallel(
+    validator,
+    models,
+    stop=True,
+    translations=None,
+    chunk_size=10000,
+    max_workers=None,
+    indices_only=False,
+):
+    """Validates `models` on a pool of worker processes that is
+    started for this call only, see `ParallelValidator`.
+    """
+    with ParallelValidator(
+        validator, translations, stop, chunk_size, max_workers
+    ) as v:
+        return v.validate_many(models, indices_only)
+
+
+# region: internal details
+
+worker = None
+
+
+def init_worker(validator, catalog, stop):
+    global worker
+    get = catalog.get
+
+    def gettext(message):
+        return get(message, message)
+
+    worker = (validator, gettext, stop)
+
+
+def validate_chunk(models, indices_only):
+    validator, gettext, stop = worker
+    return validator.validate_many(
+        models, stop, gettext=gettext, indices_only=indices_only
+    )
+
+
+def translate_templates(validator, gettext):
+    """Returns a dict of message templates used by rules of `validator`
+    translated with `gettext`.
+    """
+    catalog = {}
+    validators = [validator]
+    while validators:
+        v = validators.pop()
+        rules = [
+            rule
+            for name, field_rules in getattr(v, "rules", ())
+            for rule in field_rules
+        ]
+        while rules:
+            rule = rules.pop()
+            template = getattr(rule, "message_template", None)
+            if isinstance(template, str):
+                catalog[template] = gettext(template)
+            rules.extend(getattr(rule, "rules", ()))
+            if hasattr(rule, "rule"):
+                rules.append(rule.rule)
+        validators.extend([inner for name, inner in getattr(v, "inner", ())])
+        if hasattr(v, "validator"):
+            validators.append(v.validator)
+    return catalog
@@ -1,8 +1,15 @@
 import re
+from collections import OrderedDict
 from datetime import date, datetime, time, timezone
+from threading import Lock
 from time import time as unixtime
 
-from wheezy.validation.comp import ref_getter
+from wheezy.validation.comp import path_value, ref_getter
+from wheezy.validation.messages import (
+    ErrorCode,
+    MessageTemplate,
+    code_gettext,
+)
 
 UTC = timezone.utc
 required_but_missing = [date.min, datetime.min, time.min]
@@ -12,6 +19,36 @@ def _(s):
     return s
 
 
+class LazyPattern(object):
+    """Regular expression pattern compiled on first search, used by
+    built-in rules, e.g. `email`. Once compiled, ``search`` is the one
+    of compiled regular expression, other attributes (e.g. ``match``)
+    are looked up in compiled regular expression.
+    """
+
+    __slots__ = ("pattern", "flags", "search")
+
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self.flags = flags
+        self.search = self.compile_and_search
+
+    def __reduce__(self):
+        return LazyPattern, (self.pattern, self.flags)
+
+    def compile(self):
+        """Compiles the pattern, returns compiled regular expression."""
+        regex = re.compile(self.pattern, self.flags)
+        self.search = regex.search
+        return regex
+
+    def __getattr__(self, name):
+        return getattr(self.compile(), name)
+
+    def compile_and_search(self, string):
+        return self.compile().search(string)
+
+
 class RequiredRule(object):
     """Any value evaluated to boolean ``True`` pass this rule.
     You can extend this validator by supplying additional
@@ -21,8 +58,9 @@ class RequiredRule(object):
     __slots__ = "message_template"
 
     def __init__(self, message_template=None):
-        self.message_template = message_template or _(
-            "Required field cannot be left blank."
+        self.message_template = MessageTemplate(
+            "required",
+            message_template or _("Required field cannot be left blank."),
         )
 
     def __call__(self, message_template):
@@ -42,8 +80,9 @@ class NotNoneRule(object):
     __slots__ = "message_template"
 
     def __init__(self, message_template=None):
-        self.message_template = message_template or _(
-            "Required field cannot be left blank."
+        self.message_template = MessageTemplate(
+            "not_none",
+            message_template or _("Required field cannot be left blank."),
         )
 
     def __call__(self, message_template):
@@ -63,8 +102,9 @@ class MissingRule(object):
     __slots__ = "message_template"
 
     def __init__(self, message_template=None):
-        self.message_template = message_template or _(
-            "Field cannot have a value."
+        self.message_template = MessageTemplate(
+            "missing",
+            message_template or _("Field cannot have a value."),
         )
 
     def __call__(self, message_template):
@@ -95,27 +135,38 @@ class LengthRule(object):
             if not max:
                 self.min = min
                 self.validate = self.check_min
-                self.message_template = message_template or _(
-                    "Required to be a minimum of %(min)d characters"
-                    " in length."
+                self.message_template = MessageTemplate(
+                    "length.min",
+                    message_template
+                    or _(
+                        "Required to be a minimum of %(min)d characters"
+                        " in length."
+                    ),
                 )
             elif min == max:
                 self.validate = self.check_equal
-                self.message_template = message_template or _(
-                    "The length must be exactly %(len)d" " characters."
+                self.message_template = MessageTemplate(
+                    "length.equal",
+                    message_template
+                    or _("The length must be exactly %(len)d" " characters."),
                 )
             else:
                 self.max = max
                 self.validate = self.check_range
-                self.message_template = message_template or _(
-                    "The length must fall within the range %(min)d"
-                    " - %(max)d characters."
+                self.message_template = MessageTemplate(
+                    "length.range",
+                    message_template
+                    or _(
+                        "The length must fall within the range %(min)d"
+                        " - %(max)d characters."
+                    ),
                 )
         elif max:
             self.max = max
             self.validate = self.check_max
-            self.message_template = message_template or _(
-                "Exceeds maximum length of %(max)d."
+            self.message_template = MessageTemplate(
+                "length.max",
+                message_template or _("Exceeds maximum length of %(max)d."),
             )
         else:
             self.validate = self.succeed
@@ -161,26 +212,42 @@ class LengthRule(object):
 
 
 class CompareRule(object):
-    """Compares attribute being validated with some other attribute value."""
+    """Compares attribute being validated with some other attribute value.
+    The comparand can be a dotted path, e.g. ``address.zip``.
+    """
 
-    __slots__ = ("validate", "comparand", "message_template")
+    __slots__ = ("validate", "comparand", "path", "message_template")
 
     def __init__(self, equal=None, not_equal=None, message_template=None):
         """Initialization selects the most appropriate validation
         strategy.
         """
+        comparand = equal or not_equal
+        if comparand and "." in comparand:
+            self.path = tuple(comparand.split("."))
+        else:
+            self.path = None
         if equal:
             self.comparand = equal
             self.validate = self.check_equal
-            self.message_template = message_template or _(
-                "The value failed equality comparison" ' with "%(comparand)s".'
+            self.message_template = MessageTemplate(
+                "compare.equal",
+                message_template
+                or _(
+                    "The value failed equality comparison"
+                    ' with "%(comparand)s".'
+                ),
             )
         elif not_equal:
             self.comparand = not_equal
             self.validate = self.check_not_equal
-            self.message_template = message_template or _(
-                "The value failed not equal comparison"
-                ' with "%(comparand)s".'
+            self.message_template = MessageTemplate(
+                "compare.not_equal",
+                message_template
+                or _(
+                    "The value failed not equal comparison"
+                    ' with "%(comparand)s".'
+                ),
             )
         else:
             self.validate = self.succeed
@@ -189,8 +256,10 @@ class CompareRule(object):
         return True
 
     def check_equal(self, value, name, model, result, gettext):
-        getter = ref_getter(model)
-        comparand_value = getter(model, self.comparand)
+        if self.path is None:
+            comparand_value = ref_getter(model)(model, self.comparand)
+        else:
+            comparand_value = path_value(model, self.path)
         if value != comparand_value:
             result.append(
                 gettext(self.message_template) % {"comparand": self.comparand}
@@ -199,8 +268,10 @@ class CompareRule(object):
         return True
 
     def check_not_equal(self, value, name, model, result, gettext):
-        getter = ref_getter(model)
-        comparand_value = getter(model, self.comparand)
+        if self.path is None:
+            comparand_value = ref_getter(model)(model, self.comparand)
+        else:
+            comparand_value = path_value(model, self.path)
         if value == comparand_value:
             result.append(
                 gettext(self.message_template) % {"comparand": self.comparand}
@@ -221,8 +292,10 @@ class PredicateRule(object):
 
     def __init__(self, predicate, message_template=None):
         self.predicate = predicate
-        self.message_template = message_template or _(
-            "Required to satisfy validation predicate condition."
+        self.message_template = MessageTemplate(
+            "predicate",
+            message_template
+            or _("Required to satisfy validation predicate condition."),
         )
 
     def validate(self, value, name, model, result, gettext):
@@ -244,8 +317,10 @@ class ValuePredicateRule(object):
 
     def __init__(self, predicate, message_template=None):
         self.predicate = predicate
-        self.message_template = message_template or _(
-            "Required to satisfy validation value predicate condition."
+        self.message_template = MessageTemplate(
+            "value_predicate",
+            message_template
+            or _("Required to satisfy validation value predicate condition."),
         )
 
     def validate(self, value, name, model, result, gettext):
@@ -273,13 +348,16 @@ class RegexRule(object):
             self.regex = regex
         if negated:
             self.validate = self.check_not_found
-            self.message_template = message_template or _(
-                "Required to not match validation pattern."
+            self.message_template = MessageTemplate(
+                "regex.negated",
+                message_template
+                or _("Required to not match validation pattern."),
             )
         else:
             self.validate = self.check_found
-            self.message_template = message_template or _(
-                "Required to match validation pattern."
+            self.message_template = MessageTemplate(
+                "regex",
+                message_template or _("Required to match validation pattern."),
             )
 
     def check_found(self, value, name, model, result, gettext):
@@ -306,7 +384,7 @@ class SlugRule(RegexRule):
 
     def __init__(self, message_template=None):
         super(SlugRule, self).__init__(
-            r"^[-\w]+$",
+            LazyPattern(r"^[-\w]+$"),
             False,
             message_template
             or _(
@@ -314,6 +392,7 @@ class SlugRule(RegexRule):
                 "digits, underscopes and/or hyphens."
             ),
         )
+        self.message_template = MessageTemplate("slug", self.message_template)
 
     def __call__(self, message_template):
         """Let you customize message template."""
@@ -327,12 +406,13 @@ class EmailRule(RegexRule):
 
     def __init__(self, message_template=None):
         super(EmailRule, self).__init__(
-            re.compile(
+            LazyPattern(
                 r"^[A-Z0-9._%-]+@[A-Z0-9.-]+\.[A-Z]{2,5}$", re.IGNORECASE
             ),
             False,
             message_template or _("Required to be a valid email address."),
         )
+        self.message_template = MessageTemplate("email", self.message_template)
 
     def __call__(self, message_template):
         """Let you customize message template."""
@@ -346,11 +426,14 @@ class ScientificRule(RegexRule):
 
     def __init__(self, message_template=None):
         super(ScientificRule, self).__init__(
-            re.compile(r"^[+\-]?(?:0|[1-9]\d*)(?:\.\d*)?(?:[eE][+\-]?\d+)?$"),
+            LazyPattern(r"^[+\-]?(?:0|[1-9]\d*)(?:\.\d*)?(?:[eE][+\-]?\d+)?$"),
             False,
             message_template
             or _("Required to be a valid number in scientific format."),
         )
+        self.message_template = MessageTemplate(
+            "scientific", self.message_template
+        )
 
     def __call__(self, message_template):
         """Let you customize message template."""
@@ -364,13 +447,16 @@ class Base64Rule(RegexRule):
 
     def __init__(self, altchars="+/", message_template=None):
         super(Base64Rule, self).__init__(
-            re.compile(
+            LazyPattern(
                 "^(?:[A-Za-z0-9%s]{4})*(?:[A-Za-z0-9%s]{2}==|"
                 "[A-Za-z0-9%s]{3}=)?$" % ((altchars,) * 3)
             ),
             False,
             message_template or _("Required to be a valid base64 string."),
         )
+        self.message_template = MessageTemplate(
+            "base64", self.message_template
+        )
 
     def __call__(self, message_template, altchars="+/"):
         """Let you customize message template."""
@@ -391,6 +477,9 @@ class URLSafeBase64Rule(Base64Rule):
             message_template
             or _("Required to be a valid URL-safe base64 string."),
         )
+        self.message_template = MessageTemplate(
+            "urlsafe_base64", self.message_template
+        )
 
     def __call__(self, message_template):
         """Let you customize message template."""
@@ -414,22 +503,30 @@ class RangeRule(object):
             if max is None:
                 self.min = min
                 self.validate = self.check_min
-                self.message_template = message_template or _(
-                    "Required to be greater or equal to %(min)s."
+                self.message_template = MessageTemplate(
+                    "range.min",
+                    message_template
+                    or _("Required to be greater or equal to %(min)s."),
                 )
             else:
                 self.max = max
                 self.validate = self.check_range
-                self.message_template = message_template or _(
-                    "The value must fall within the range %(min)s"
-                    " - %(max)s."
+                self.message_template = MessageTemplate(
+                    "range.range",
+                    message_template
+                    or _(
+                        "The value must fall within the range %(min)s"
+                        " - %(max)s."
+                    ),
                 )
         else:
             if max is not None:
                 self.max = max
                 self.validate = self.check_max
-                self.message_template = message_template or _(
-                    "Exceeds maximum allowed value of %(max)s."
+                self.message_template = MessageTemplate(
+                    "range.max",
+                    message_template
+                    or _("Exceeds maximum allowed value of %(max)s."),
                 )
             else:
                 self.validate = self.succeed
@@ -554,8 +651,10 @@ class OneOfRule(object):
         """Initializes rule by supplying valid `items`."""
         assert items
         self.items = tuple(items)
-        self.message_template = message_template or _(
-            "The value does not belong to the list of known items."
+        self.message_template = MessageTemplate(
+            "one_of",
+            message_template
+            or _("The value does not belong to the list of known items."),
         )
 
     def validate(self, value, name, model, result, gettext):
@@ -585,21 +684,25 @@ class RelativeDeltaRule(object):
             if not max:
                 self.min = min
                 self.validate = self.check_min
-                self.message_template = message_template or _(
-                    "Required to be above a minimum allowed."
+                self.message_template = MessageTemplate(
+                    "relative_delta.min",
+                    message_template
+                    or _("Required to be above a minimum allowed."),
                 )
             else:
                 self.max = max
                 self.validate = self.check_range
-                self.message_template = message_template or _(
-                    "Must fall within a valid range."
+                self.message_template = MessageTemplate(
+                    "relative_delta.range",
+                    message_template or _("Must fall within a valid range."),
                 )
         else:
             if max:
                 self.max = max
                 self.validate = self.check_max
-                self.message_template = message_template or _(
-                    "Exceeds maximum allowed."
+                self.message_template = MessageTemplate(
+                    "relative_delta.max",
+                    message_template or _("Exceeds maximum allowed."),
                 )
             else:
                 self.validate = self.succeed
@@ -740,8 +843,9 @@ class AdapterRule(object):
     def __init__(self, converter, rule, message_template=None):
         self.converter = converter
         self.rule = rule
-        self.message_template = message_template or _(
-            "Required to satisfy a converter format."
+        self.message_template = MessageTemplate(
+            "adapter",
+            message_template or _("Required to satisfy a converter format."),
         )
 
     def validate(self, value, name, model, result, gettext):
@@ -764,11 +868,85 @@ class IntAdapterRule(AdapterRule):
             rule,
             message_template or _("Required to satisfy an integer format."),
         )
+        self.message_template = MessageTemplate(
+            "int_adapter", self.message_template
+        )
+
+
+class CachedRule(object):
+    """Memoizes outcome of ``rule`` per value: pass or fail and message
+    templates with their arguments, so messages are translated for each
+    call. Use it for expensive rules that depend on value only, e.g.
+    ``regex``, ``value_predicate`` or ``adapter``, when values repeat.
+
+    Up to ``max_size`` least recently used values are kept. Values
+    that are not hashable are not cached. A failed outcome is not
+    cached if the rule reports a message that is not a
+    ``MessageTemplate``, e.g. a custom rule, since it is translated by
+    the rule itself. It is thread safe.
+    """
+
+    __slots__ = ("rule", "max_size", "cache", "lock", "hits", "misses")
+
+    def __init__(self, rule, max_size=1000):
+        self.rule = rule
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __reduce__(self):
+        return CachedRule, (self.rule, self.max_size)
+
+    def clear(self):
+        """Discards cached outcomes and resets counters."""
+        with self.lock:
+            self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def validate(self, value, name, model, result, gettext):
+        key = (value.__class__, value)
+        cache = self.cache
+        try:
+            with self.lock:
+                succeed, messages = cache[key]
+                cache.move_to_end(key)
+                self.hits += 1
+        except KeyError:
+            plain = []
+
+            def record_gettext(message):
+                if isinstance(message, MessageTemplate):
+                    return code_gettext(message)
+                plain.append(message)
+                return gettext(message)
+
+            messages = []
+            succeed = self.rule.validate(
+                value, name, model, messages, record_gettext
+            )
+            messages = tuple(messages)
+            with self.lock:
+                self.misses += 1
+                if not plain:
+                    cache[key] = succeed, messages
+                    if len(cache) > self.max_size:
+                        cache.popitem(last=False)
+        except TypeError:
+            return self.rule.validate(value, name, model, result, gettext)
+        for message in messages:
+            if isinstance(message, ErrorCode):
+                message = message.translate(gettext)
+            result.append(message)
+        return succeed
 
 
 adapter = AdapterRule
 and_ = AndRule
 base64 = standard_base64 = Base64Rule()
+cached = CachedRule
 compare = CompareRule
 email = EmailRule()
 ignore = IgnoreRule
@@ -0,0 +1,181 @@
+from dataclasses import fields, is_dataclass
+from types import NoneType, UnionType
+from typing import Annotated, Union, get_args, get_origin, get_type_hints
+
+from wheezy.validation.i18n import resolve_gettext
+from wheezy.validation.model import locale_value_providers, value_providers
+from wheezy.validation.rules import IteratorRule
+from wheezy.validation.validator import (
+    CollectionValidator,
+    OptionalValidator,
+    Validator,
+)
+
+
+class Schema(object):
+    """Validator and binding plan derived from fields of a dataclass.
+
+    Rules of a field are kept in ``typing.Annotated`` metadata, the
+    field type is unwrapped from ``Optional``. Rules of ``list`` items
+    are applied with ``iterator`` rule. A field of dataclass type (or a
+    list of them) is validated by a nested validator, unless it is
+    ``None`` for an ``Optional`` field, after rules of the field.
+    Recursive dataclasses are not supported.
+
+    Example::
+
+        @dataclass
+        class Credential:
+            username: Annotated[str, required, length(max=10)] = ""
+            password: Annotated[str, required, length(min=8)] = ""
+            tags: list[Annotated[str, length(max=5)]] = field(
+                default_factory=list)
+
+        credential_schema = Schema(Credential)
+        if credential_schema.update_model(credential, values, errors) and \\
+                credential_schema.validate(credential, errors):
+            pass
+
+    The `validate` is a compiled validator function, see
+    `Validator.compile`. The schema is derived once, create it per
+    dataclass, not per call.
+    """
+
+    def __init__(self, model_class, schemas=None):
+        assert is_dataclass(model_class)
+        if schemas is None:
+            schemas = {}
+        schemas[model_class] = self
+        self.model_class = model_class
+        mapping = {}
+        inner = {}
+        plan = []
+        hints = get_type_hints(model_class, include_extras=True)
+        for f in fields(model_class):
+            t, rules, optional = unwrap(hints[f.name])
+            item_type = None
+            if get_origin(t) is list:
+                args = get_args(t)
+                if args:
+                    item_type, item_rules, _ = unwrap(args[0])
+                    if item_rules:
+                        rules.append(IteratorRule(item_rules))
+            if rules:
+                mapping[f.name] = rules
+            if is_dataclass(t):
+                nested = schema_of(t, schemas)
+                if optional:
+                    inner[f.name] = OptionalValidator(nested.validator)
+                else:
+                    inner[f.name] = nested.validator
+                plan.append((f.name, None, False, nested))
+                continue
+            if is_dataclass(item_type):
+                inner[f.name] = CollectionValidator(
+                    schema_of(item_type, schemas).validator
+                )
+                continue
+            if item_type is not None:
+                if item_type.__name__ in value_providers:
+                    plan.append((f.name, item_type.__name__, True, None))
+            elif isinstance(t, type):
+                if t.__name__ in value_providers:
+                    plan.append((f.name, t.__name__, False, None))
+        self.validator = Validator(mapping)
+        # a field may have both rules and a nested validator
+        self.validator.inner += Validator(inner).inner
+        # a tuple of (name, value provider name, is list, nested schema)
+        self.plan = tuple(plan)
+        self.validate = self.validator.compile()
+
+    def update_model(self, model, values, results, translations=None):
+        """Updates `model` with `values` the same way
+        `try_update_model` does, except that attributes and their
+        value providers are known from the schema. A nested dataclass
+        attribute is updated from a dict value.
+        """
+        gettext = resolve_gettext(translations)
+        return update_model(
+            self.plan,
+            model,
+            values,
+            results,
+            gettext,
+            locale_value_providers(translations),
+        )
+
+
+# region: internal details
+
+
+def schema_of(model_class, schemas):
+    schema = schemas.get(model_class)
+    if schema is None:
+        schema = Schema(model_class, schemas)
+    elif not hasattr(schema, "validator"):
+        raise TypeError(
+            "Recursive dataclass %s is not supported." % model_class.__name__
+        )
+    return schema
+
+
+def unwrap(t):
+    """Returns a type, rules of ``Annotated`` metadata and whether the
+    type is unwrapped from ``Optional``.
+    """
+    rules = []
+    optional = False
+    while True:
+        origin = get_origin(t)
+        if origin is Annotated:
+            args = get_args(t)
+            t = args[0]
+            rules.extend([r for r in args[1:] if hasattr(r, "validate")])
+        elif origin is Union or origin is UnionType:
+            args = [a for a in get_args(t) if a is not NoneType]
+            if len(args) != 1:
+                return t, rules, optional
+            optional = True
+            t = args[0]
+        else:
+            return t, rules, optional
+
+
+def update_model(plan, model, values, results, gettext, providers):
+    succeed = True
+    for name, provider_name, multiple, nested in plan:
+        if name not in values:
+            continue
+        value = values[name]
+        if nested is not None:
+            nested_model = getattr(model, name)
+            if nested_model is not None and isinstance(value, dict):
+                succeed &= update_model(
+                    nested.plan,
+                    nested_model,
+                    value,
+                    results,
+                    gettext,
+                    providers,
+                )
+            continue
+        provider = providers[provider_name]
+        if multiple:
+            try:
+                setattr(
+                    model, name, [provider(item, gettext) for item in value]
+                )
+            except (ArithmeticError, ValueError):
+                results[name] = [
+                    gettext("Multiple input was not in a correct format.")
+                ]
+                succeed = False
+        else:
+            if isinstance(value, list):
+                value = value and value[-1] or ""
+            try:
+                setattr(model, name, provider(value, gettext))
+            except (ArithmeticError, ValueError):
+                results[name] = [gettext("Input was not in a correct format.")]
+                succeed = False
+    return succeed
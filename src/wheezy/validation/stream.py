@@ -0,0 +1,160 @@
+import sys
+from argparse import ArgumentParser
+from json import dumps, loads
+
+from wheezy.validation.comp import import_name
+from wheezy.validation.i18n import resolve_gettext
+from wheezy.validation.model import try_update_model
+
+
+def validate_lines(
+    validator, lines, model_factory=None, stop=True, translations=None
+):
+    """Validates JSON Lines, an iterable of lines, e.g. a file object.
+    Lines are read one at a time, so memory use does not depend on the
+    number of lines. Blank lines are skipped.
+
+    If `model_factory` is given, each record is converted into a model
+    it returns with `try_update_model` before validation, otherwise the
+    record (a dict) is validated as is.
+
+    Yields a tuple of line number, model and errors, the errors are
+    empty if the model is valid.
+    """
+    for number, _, _, model, errors in iter_lines(
+        validator, lines, model_factory, stop, translations
+    ):
+        yield number, model, errors
+
+
+def validate_stream(
+    validator,
+    lines,
+    valid_output,
+    error_output,
+    model_factory=None,
+    stop=True,
+    translations=None,
+):
+    """Validates JSON Lines read from `lines`, see `validate_lines`.
+    Valid lines are written to `valid_output` unchanged. For each
+    invalid line an error record with line number, errors and the
+    record is written to `error_output`.
+
+    Returns a tuple of the number of valid and invalid records.
+    """
+    valid = invalid = 0
+    for number, line, record, _, errors in iter_lines(
+        validator, lines, model_factory, stop, translations
+    ):
+        if errors:
+            invalid += 1
+            error_output.write(
+                dumps(
+                    {"line": number, "errors": errors, "record": record},
+                    default=str,
+                )
+            )
+            error_output.write("\n")
+        else:
+            valid += 1
+            valid_output.write(line.rstrip("\r\n"))
+            valid_output.write("\n")
+    return valid, invalid
+
+
+def main(args=None):
+    """Command line entry point, returns exit status: 0 if all records
+    are valid, otherwise 1::
+
+        python -m wheezy.validation.stream myapp.validation.user_validator \\
+            users.jsonl --valid valid.jsonl --errors errors.jsonl
+    """
+    parser = ArgumentParser(
+        prog="python -m wheezy.validation.stream",
+        description="Validates JSON Lines records.",
+    )
+    parser.add_argument(
+        "validator", help="dotted path to validator, e.g. myapp.v.user"
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="input file, default stdin"
+    )
+    parser.add_argument(
+        "--model", help="dotted path to model factory, e.g. myapp.User"
+    )
+    parser.add_argument("--valid", help="output of valid records")
+    parser.add_argument("--errors", help="output of error records")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="report all errors of a field, not just the first one",
+    )
+    options = parser.parse_args(args)
+    validator = import_name(options.validator)
+    model_factory = options.model and import_name(options.model) or None
+    files = []
+    try:
+        lines = open_file(options.input, "r", sys.stdin, files)
+        valid_output = open_file(options.valid, "w", sys.stdout, files)
+        error_output = open_file(options.errors, "w", sys.stderr, files)
+        valid, invalid = validate_stream(
+            validator,
+            lines,
+            valid_output,
+            error_output,
+            model_factory,
+            not options.all,
+        )
+    finally:
+        for f in files:
+            f.close()
+    return invalid and 1 or 0
+
+
+# region: internal details
+
+
+def iter_lines(validator, lines, model_factory, stop, translations):
+    """Yields a tuple of line number, line, record, model and errors
+    for each non blank line. The record is the line stripped if it is
+    not JSON.
+    """
+    gettext = resolve_gettext(translations)
+    number = 0
+    for line in lines:
+        number += 1
+        if not line.strip():
+            continue
+        errors = {}
+        try:
+            record = loads(line)
+        except ValueError:
+            record = line.strip()
+        if not isinstance(record, dict):
+            errors["__ERROR__"] = [
+                gettext("Input was not in a correct format.")
+            ]
+            yield number, line, record, None, errors
+            continue
+        if model_factory is None:
+            model = record
+        else:
+            model = model_factory()
+            if not try_update_model(model, record, errors, translations):
+                yield number, line, record, model, errors
+                continue
+        validator.validate(model, errors, stop, None, gettext)
+        yield number, line, record, model, errors
+
+
+def open_file(path, mode, default, files):
+    if not path or path == "-":
+        return default
+    f = open(path, mode, encoding="UTF-8")
+    files.append(f)
+    return f
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
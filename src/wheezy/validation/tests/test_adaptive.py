@@ -0,0 +1,88 @@
+import unittest
+
+from wheezy.validation import adaptive
+from wheezy.validation.adaptive import AdaptiveValidator, pin
+from wheezy.validation.rules import length, must, required
+
+
+class AdaptiveValidatorTestCase(unittest.TestCase):
+    def setUp(self):
+        # A fake clock ticks on every read, the slow rule costs more.
+        self.now = 0.0
+        self.perf_counter = adaptive.perf_counter
+        adaptive.perf_counter = self.clock
+        self.slow = must(self.slow_predicate)
+        self.short = length(min=4)
+        self.v = AdaptiveValidator(
+            {"name": [self.slow, required, self.short]}, epoch=10, sample=1
+        )
+
+    def tearDown(self):
+        adaptive.perf_counter = self.perf_counter
+
+    def clock(self):
+        self.now += 1.0
+        return self.now
+
+    def slow_predicate(self, value):
+        self.now += 100.0
+        return True
+
+    def test_reorder(self):
+        """Cheap and likely to fail rules run first."""
+        for _ in range(9):
+            assert not self.v.validate({"name": "abc"}, {})
+        assert (self.slow, required, self.short) == self.v.rules[0][1]
+        assert not self.v.validate({"name": "abc"}, {})
+        assert (self.short, required, self.slow) == self.v.rules[0][1]
+
+    def test_deterministic(self):
+        """The first error does not change within an epoch."""
+        errors = []
+        for i in range(1, 20):
+            results = {}
+            name = i % 2 and "abc" or ""
+            assert not self.v.validate({"name": name}, results)
+            if not name:
+                errors.append(results["name"][0])
+        assert 9 == len(errors)
+        # calls 2..8 are within the first epoch, 10..18 in the second
+        assert [required.message_template] * 4 == errors[:4]
+        assert required.message_template not in errors[4:]
+        assert 1 == len(set(errors[4:]))
+
+    def test_pinned(self):
+        """Pinned rules keep declared position."""
+        v = AdaptiveValidator(
+            {"name": [pin(self.slow), required, self.short]},
+            epoch=10,
+            sample=1,
+        )
+        for _ in range(20):
+            v.validate({"name": "abc"}, {})
+        assert (self.slow, self.short, required) == v.rules[0][1]
+
+    def test_all_errors(self):
+        """Rules run in declared order if stop is False."""
+        for _ in range(10):
+            self.v.validate({"name": "abc"}, {})
+        assert self.short is self.v.rules[0][1][0]
+        for sample in (1, 2):
+            self.v.sample = sample
+            for _ in range(2):
+                results = {}
+                assert not self.v.validate({"name": ""}, results, stop=False)
+                assert required.message_template == results["name"][0]
+                assert 2 == len(results["name"])
+
+    def test_same_as_validate(self):
+        """Results are the same as of declared order except messages."""
+        for sample in (1, 3):
+            v = AdaptiveValidator(
+                {"name": [required, self.short]}, epoch=5, sample=sample
+            )
+            for _ in range(10):
+                for name, valid in (("john", True), ("", False), ("x", False)):
+                    results = {}
+                    assert valid == v.validate({"name": name}, results)
+                    assert valid != bool(results)
@@ -0,0 +1,145 @@
+import unittest
+
+from wheezy.validation.columnar import Row, as_array, np, validate_columns
+from wheezy.validation.rules import (
+    compare,
+    email,
+    length,
+    must,
+    not_none,
+    one_of,
+    predicate,
+    range,
+    regex,
+    required,
+)
+from wheezy.validation.validator import Validator
+
+user_validator = Validator(
+    {
+        "name": [required, length(min=2), length(max=5), regex("^[a-z]+$")],
+        "code": [length(min=2, max=3), length(min=3, max=3), length()],
+        "email": [required, email],
+        "age": [range(min=18), range(max=99), range(min=1, max=120)],
+        "score": [not_none, range(min=0.5)],
+        "active": [required],
+        "role": [one_of(("user", "admin")), must(lambda v: v != "admin")],
+        "level": [one_of((1, 2, 3))],
+        "confirm": [compare(equal="name")],
+        "flag": [predicate(lambda m: m["age"] != 33)],
+    }
+)
+
+rows = [
+    {
+        "name": "john",
+        "code": "abc",
+        "email": "john@somewhere.net",
+        "age": 33,
+        "score": 1.5,
+        "active": True,
+        "role": "user",
+        "level": 1,
+        "confirm": "john",
+        "flag": 0,
+    },
+    {
+        "name": "",
+        "code": "a",
+        "email": "x@y",
+        "age": 15,
+        "score": 0.1,
+        "active": False,
+        "role": "admin",
+        "level": 4,
+        "confirm": "x",
+        "flag": 0,
+    },
+    {
+        "name": "Bartholomew",
+        "code": "abcd",
+        "email": "",
+        "age": 130,
+        "score": 0.5,
+        "active": True,
+        "role": "guest",
+        "level": 0,
+        "confirm": "Bartholomew",
+        "flag": 0,
+    },
+]
+
+
+def to_columns(rows):
+    return dict([(name, [row[name] for row in rows]) for name in rows[0]])
+
+
+class ValidateColumnsTestCase(unittest.TestCase):
+    def assert_same(self, columns, rows):
+        for stop in (True, False):
+            expected = user_validator.validate_many(rows, stop)
+            assert expected == validate_columns(user_validator, columns, stop)
+
+    def test_lists(self):
+        """Results are the same as validating each row."""
+        self.assert_same(to_columns(rows), rows)
+
+    def test_empty(self):
+        assert {} == validate_columns(user_validator, {})
+        assert {} == validate_columns(user_validator, {"name": []})
+
+    def test_nested(self):
+        """Nested validators are applied to each row."""
+        v = Validator({"user": user_validator})
+        columns = {"user": rows}
+        assert v.validate_many([{"user": row} for row in rows]) == (
+            validate_columns(v, columns)
+        )
+
+    def test_row(self):
+        row = Row({"a": [1, 2]}, 1)
+        assert 2 == row["a"]
+        assert 2 == row.a
+        assert ["a"] == list(row)
+        self.assertRaises(AttributeError, lambda: row.b)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class ValidateNumpyColumnsTestCase(ValidateColumnsTestCase):
+    def test_arrays(self):
+        """Vectorized rules give the same results."""
+        columns = dict(
+            [
+                (name, np.array(column))
+                for name, column in to_columns(rows).items()
+            ]
+        )
+        columns["score"] = np.array([1.5, 0.1, None], dtype=object)
+        r = [dict(row) for row in rows]
+        r[2]["score"] = None
+        self.assert_same(columns, r)
+
+    def test_mixed_lists(self):
+        """List columns of mixed types are kept as objects."""
+        assert "i" == as_array([1, True]).dtype.kind
+        assert "U" == as_array(["a", "b"]).dtype.kind
+        assert "O" == as_array([1, "1"]).dtype.kind
+        assert "O" == as_array([[1], [2]]).dtype.kind
+        v = Validator(
+            {"level": [one_of((1, 2, 3))], "name": [required, length(max=1)]}
+        )
+        columns = {"level": [1, "2", 2.0], "name": ["a", None, "ab"]}
+        rows = [
+            {"level": level, "name": name}
+            for level, name in zip(columns["level"], columns["name"])
+        ]
+        assert v.validate_many(rows) == validate_columns(v, columns)
+
+    def test_large(self):
+        """Errors are produced for failed rows only."""
+        size = 100000
+        ages = np.arange(size) % 100
+        errors = validate_columns(
+            Validator({"age": [range(min=1)]}), {"age": ages}
+        )
+        assert np.arange(0, size, 100).tolist() == sorted(errors)
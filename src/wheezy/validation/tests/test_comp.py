@@ -0,0 +1,53 @@
+import unittest
+from collections import namedtuple
+from dataclasses import dataclass
+from operator import getitem
+
+from wheezy.validation.comp import path_value, ref_getter
+
+
+class User(object):
+    def __init__(self, name, address=None):
+        self.name = name
+        self.address = address
+
+
+class SlotsUser(object):
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+@dataclass
+class DataUser:
+    name: str
+
+
+TupleUser = namedtuple("TupleUser", ("name",))
+
+
+class RefGetterTestCase(unittest.TestCase):
+    def test_model_types(self):
+        """Attributes or items are accessed depending on model type."""
+        for model in (
+            {"name": "john"},
+            User("john"),
+            SlotsUser("john"),
+            DataUser("john"),
+            TupleUser("john"),
+        ):
+            assert "john" == ref_getter(model)(model, "name")
+
+    def test_getter(self):
+        """Getters do not refer to a model type."""
+        assert ref_getter({}) is getitem
+        assert ref_getter(TupleUser("x")) is getattr
+        assert ref_getter(User("x")) is getattr
+
+    def test_dotted(self):
+        """Dotted path walks mixed models, None part gives None."""
+        model = User("john", {"city": User("Kyiv")})
+        assert "Kyiv" == path_value(model, ("address", "city", "name"))
+        model = User("john")
+        assert path_value(model, ("address", "city")) is None
@@ -0,0 +1,238 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from wheezy.validation.compiler import Compiler, main
+from wheezy.validation.rules import (
+    and_,
+    compare,
+    email,
+    ignore,
+    iterator,
+    length,
+    missing,
+    must,
+    not_none,
+    one_of,
+    predicate,
+    range,
+    regex,
+    required,
+    slug,
+)
+from wheezy.validation.validator import Validator
+
+
+class User(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+user_validator = Validator(
+    {
+        "name": [required, length(min=2), length(max=10), slug],
+        "code": [length(min=3, max=3), length(min=2, max=4)],
+        "email": [not_none, email, regex("example", negated=True)],
+        "age": [range(min=18), range(max=99), range(min=1, max=120)],
+        "balance": [range(min=Decimal("0.01"))],
+        "password": [required, compare(equal="confirm")],
+        "confirm": [ignore(), length(), range()],
+        "nickname": [missing],
+        "role": [one_of(("user", "admin")), must(lambda v: v != "admin")],
+        "tags": [iterator([required, length(max=3)])],
+        "flag": [
+            predicate(lambda m: m is not None),
+            and_(required, must(bool)),
+        ],
+    }
+)
+
+registration_validator = Validator(
+    {"user": user_validator, "terms": [required]}
+)
+
+samples = [
+    {
+        "name": "john",
+        "code": "abc",
+        "email": "john@somewhere.net",
+        "age": 33,
+        "balance": Decimal("1"),
+        "password": "secret",
+        "confirm": "secret",
+        "nickname": "",
+        "role": "user",
+        "tags": ["a", "b"],
+        "flag": True,
+    },
+    {
+        "name": "",
+        "code": "abcde",
+        "email": "john@example.com",
+        "age": 15,
+        "balance": Decimal("0"),
+        "password": "",
+        "confirm": "x",
+        "nickname": "x",
+        "role": "admin",
+        "tags": ["", "abcd"],
+        "flag": False,
+    },
+    {
+        "name": "j!",
+        "code": None,
+        "email": None,
+        "age": 130,
+        "balance": None,
+        "password": "x",
+        "confirm": "y",
+        "nickname": None,
+        "role": "guest",
+        "tags": None,
+        "flag": None,
+    },
+]
+
+
+class CompileTestCase(unittest.TestCase):
+    def assert_same(self, validator, model):
+        validate = validator.compile()
+        for stop in (True, False):
+            expected = {}
+            results = {}
+            succeed = validator.validate(model, expected, stop)
+            assert succeed == validate(model, results, stop)
+            assert expected == results
+
+    def test_objects(self):
+        """Compiled validator gives the same results as interpreted."""
+        for sample in samples:
+            self.assert_same(user_validator, User(**sample))
+
+    def test_dicts(self):
+        """Compiled validator supports dict models."""
+        for sample in samples:
+            self.assert_same(user_validator, dict(sample))
+
+    def test_nested(self):
+        """Compiled validator flattens nested validators."""
+        for sample in samples:
+            for terms in (True, False):
+                model = User(user=User(**sample), terms=terms)
+                self.assert_same(registration_validator, model)
+        source = Compiler(registration_validator).source()
+        assert "results, stop, None, gettext)" not in source
+        assert "getter1(model1, 'name')" in source
+
+    def test_deeply_nested(self):
+        """Nested validators of any depth and model type are flattened,
+        validators of other types are called.
+        """
+
+        class CustomValidator(Validator):
+            __slots__ = ()
+
+        address_validator = Validator(
+            {"city": [required], "zip": CustomValidator({"code": [required]})}
+        )
+        v = Validator(
+            {
+                "account": Validator(
+                    {"name": [required], "address": address_validator}
+                ),
+                "contact": Validator({"address": address_validator}),
+            }
+        )
+        for city, code in (("", ""), ("Kyiv", "01001")):
+            model = {
+                "account": User(
+                    name="", address={"city": city, "zip": {"code": code}}
+                ),
+                "contact": User(address=User(city=city, zip=User(code=code))),
+            }
+            self.assert_same(v, model)
+        source = Compiler(v).source()
+        assert 2 == source.count("'city')")
+        assert 2 == source.count("results, stop, None, gettext)")
+
+    def test_empty(self):
+        """An empty validator always succeeds."""
+        validate = Validator({}).compile()
+        assert validate(None, {})
+
+    def test_translations(self):
+        """Compiled validator uses gettext for messages."""
+        validate = user_validator.compile()
+        results = {}
+        assert not validate(
+            User(**samples[1]), results, gettext=lambda s: "* " + s
+        )
+        assert "* Required field cannot be left blank." == results["name"][0]
+
+    def test_inlined(self):
+        """Well known rules are inlined, others are called."""
+        source = Compiler(user_validator).source()
+        assert "len(value) < " in source
+        assert "value < " in source
+        assert "required_but_missing" in source
+        assert source.count("(value, 'password', model, result, gettext)")
+        assert "'confirm'" not in source
+        assert "(value, 'name'" not in source
+
+
+class ModuleTestCase(unittest.TestCase):
+    def load(self, source):
+        namespace = {}
+        exec(compile(source, "<module>", "exec"), namespace)
+        return namespace["validate"]
+
+    def test_same_as_validate(self):
+        """Emitted module gives the same results as validator."""
+        name = "wheezy.validation.tests.test_compiler.registration_validator"
+        source = Compiler(registration_validator).module(name)
+        assert "validator = import_name(%r)" % name in source
+        assert "re.compile(" in source
+        assert "Decimal('0.01')" in source
+        validate = self.load(source)
+        for sample in samples:
+            for stop in (True, False):
+                model = User(user=User(**sample), terms=False)
+                expected = {}
+                results = {}
+                succeed = registration_validator.validate(
+                    model, expected, stop
+                )
+                assert succeed == validate(model, results, stop)
+                assert expected == results
+
+    def test_standalone(self):
+        """Literals only module does not import the validator."""
+        v = Validator(
+            {
+                "name": [required, length(max=10), slug],
+                "role": [one_of(("user",))],
+            }
+        )
+        source = Compiler(v).module("myapp.validator")
+        assert "import_name" not in source
+        assert "('user',)" in source
+        validate = self.load(source)
+        results = {}
+        assert not validate({"name": "x!", "role": "user"}, results)
+        assert "slug" == results["name"][0].code
+
+    def test_main(self):
+        """Command line writes the module to a file."""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "user_validator.py")
+            assert 0 == main(
+                [
+                    "wheezy.validation.tests.test_compiler.user_validator",
+                    "-o",
+                    path,
+                ]
+            )
+            with open(path) as f:
+                validate = self.load(f.read())
+        assert validate(User(**samples[0]), {})
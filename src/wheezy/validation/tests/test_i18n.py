@@ -0,0 +1,94 @@
+import gc
+import unittest
+
+from wheezy.validation import i18n
+from wheezy.validation.i18n import (
+    cached_gettext,
+    clear_gettext_cache,
+    null_translations,
+    resolve_gettext,
+)
+from wheezy.validation.model import try_update_model
+from wheezy.validation.rules import required
+from wheezy.validation.validator import Validator
+
+
+class Translations(object):
+    def __init__(self, prefix="* "):
+        self.prefix = prefix
+        self.calls = []
+
+    def gettext(self, message):
+        self.calls.append(message)
+        return self.prefix + message
+
+
+class CachedGettextTestCase(unittest.TestCase):
+    def tearDown(self):
+        clear_gettext_cache()
+
+    def test_memoized(self):
+        """Message lookups are memoized per translations."""
+        t = Translations()
+        gettext = cached_gettext(t)
+        assert gettext is cached_gettext(t)
+        assert "* x" == gettext("x")
+        assert "* x" == gettext("x")
+        assert ["x"] == t.calls
+        assert gettext is not cached_gettext(Translations())
+
+    def test_bounded(self):
+        """Memoized messages are limited by max size."""
+        t = Translations()
+        gettext = cached_gettext(t)
+        for i in range(i18n.gettext_cache_max_size + 1):
+            gettext(str(i))
+        gettext("0")
+        assert i18n.gettext_cache_max_size + 2 == len(t.calls)
+
+    def test_clear(self):
+        """Cached functions are discarded on clear."""
+        t = Translations()
+        gettext = cached_gettext(t)
+        clear_gettext_cache()
+        assert gettext is not cached_gettext(t)
+
+    def test_evicted(self):
+        """Cached function does not keep translations alive."""
+        t = Translations()
+        cached_gettext(t)("x")
+        size = len(i18n.gettext_cache)
+        del t
+        gc.collect()
+        assert size - 1 == len(i18n.gettext_cache)
+
+    def test_resolve_gettext(self):
+        """Given gettext is used as is, otherwise of translations."""
+        t = Translations()
+
+        def gettext(message):
+            return message
+
+        assert gettext is resolve_gettext(t, gettext)
+        assert cached_gettext(t) is resolve_gettext(t)
+        assert null_translations.gettext == resolve_gettext()
+
+    def test_validator(self):
+        """Validator memoizes translations lookups."""
+        t = Translations()
+        v = Validator({"name": [required]})
+        for _ in range(2):
+            errors = {}
+            assert not v.validate({"name": ""}, errors, translations=t)
+            assert "* " + required.message_template == errors["name"][0]
+        assert 1 == len(t.calls)
+
+    def test_try_update_model(self):
+        """try_update_model memoizes translations lookups."""
+        t = Translations(prefix="")
+        for _ in range(2):
+            model = {"age": 0}
+            assert try_update_model(model, {"age": ["1,001"]}, {}, t)
+            assert 1001 == model["age"]
+        assert "," in t.calls
+        assert sorted(set(t.calls)) == sorted(t.calls)
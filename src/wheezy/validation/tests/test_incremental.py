@@ -0,0 +1,205 @@
+import unittest
+
+from wheezy.validation.incremental import IncrementalValidator, dependencies
+from wheezy.validation.rules import (
+    ValuePredicateRule,
+    and_,
+    compare,
+    int_adapter,
+    length,
+    must,
+    predicate,
+    range,
+    required,
+)
+from wheezy.validation.validator import Validator
+
+
+class CountingRule(ValuePredicateRule):
+    """Counts calls per attribute name."""
+
+    def __init__(self, calls):
+        super(CountingRule, self).__init__(bool)
+        self.calls = calls
+
+    def validate(self, value, name, model, result, gettext):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return True
+
+
+class CustomRule(object):
+    def validate(self, value, name, model, result, gettext):
+        return True
+
+
+class IncrementalValidatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.calls = {}
+        counting = and_(CountingRule(self.calls), required)
+        self.v = Validator(
+            {
+                "name": [counting, length(min=4)],
+                "password": [counting, required],
+                "confirm": [counting, compare(equal="password")],
+                "age": [counting, int_adapter(range(min=18))],
+            }
+        )
+        self.model = {
+            "name": "john",
+            "password": "x",
+            "confirm": "x",
+            "age": "33",
+        }
+
+    def test_changed(self):
+        """Rules of changed fields and their dependents run only."""
+        v = IncrementalValidator(self.v)
+        errors = {}
+        assert v.validate(self.model, errors)
+        assert {"name": 1, "password": 1, "confirm": 1, "age": 1} == (
+            self.calls
+        )
+        self.model["name"] = "abc"
+        assert not v.validate(self.model, errors, changed=["name"])
+        assert ["name"] == list(errors)
+        assert 2 == self.calls["name"]
+        assert 1 == self.calls["age"]
+        self.model["password"] = "y"
+        assert not v.validate(self.model, errors, changed=["password"])
+        assert ["name", "confirm"] == list(errors)
+        assert 2 == self.calls["confirm"]
+        self.model["name"] = "alice"
+        self.model["confirm"] = "y"
+        assert v.validate(self.model, errors, changed=["name", "confirm"])
+        assert {} == errors
+        assert 1 == self.calls["age"]
+
+    def test_tracked(self):
+        """Changes are detected by comparing with previous values."""
+        v = IncrementalValidator(self.v)
+        errors = {}
+        assert v.validate(self.model, errors)
+        self.model["age"] = "17"
+        assert not v.validate(self.model, errors)
+        assert ["age"] == list(errors)
+        assert {"name": 1, "password": 1, "confirm": 1, "age": 2} == (
+            self.calls
+        )
+        assert not v.validate(self.model, errors)
+        assert ["age"] == list(errors)
+        assert 2 == self.calls["age"]
+
+    def test_same_as_validate(self):
+        """Merged results are the same as of full validation."""
+        v = IncrementalValidator(self.v, stop=False)
+        errors = {}
+        v.validate(self.model, errors)
+        for name, value in (
+            ("name", ""),
+            ("password", ""),
+            ("age", "x"),
+            ("confirm", "z"),
+            ("name", "john"),
+        ):
+            self.model[name] = value
+            expected = {}
+            succeed = self.v.validate(self.model, expected, stop=False)
+            assert succeed == v.validate(self.model, errors, [name])
+            assert expected == errors
+
+    def test_model_dependent(self):
+        """Rules that depend on model run on any change."""
+        v = IncrementalValidator(
+            Validator(
+                {
+                    "a": [CountingRule(self.calls)],
+                    "b": [predicate(lambda m: m["a"] != m["b"])],
+                }
+            )
+        )
+        errors = {}
+        model = {"a": 1, "b": 2}
+        assert v.validate(model, errors)
+        model["a"] = 2
+        assert not v.validate(model, errors, ["a"])
+        assert ["b"] == list(errors)
+        assert not v.validate(model, errors, [])
+        assert 2 == self.calls["a"]
+
+    def test_nested(self):
+        """Nested validators are validated incrementally."""
+        v = IncrementalValidator(Validator({"user": self.v}))
+        errors = {}
+        model = {"user": self.model}
+        assert v.validate(model, errors)
+        self.model["name"] = ""
+        assert not v.validate(model, errors, ["user.name"])
+        assert ["name"] == list(errors)
+        assert 1 == self.calls["password"]
+        self.model["name"] = "john"
+        assert v.validate(model, errors)
+        assert {} == errors
+        model["user"] = dict(self.model, age="1")
+        assert not v.validate(model, errors, ["user"])
+        assert ["age"] == list(errors)
+        assert 2 == self.calls["password"]
+
+    def test_nested_custom(self):
+        """Nested objects with validate only are validated on change."""
+
+        class Inner(object):
+            def validate(self, model, results, stop, translations, gettext):
+                if model:
+                    return True
+                results["inner"] = ["x"]
+                return False
+
+        v = IncrementalValidator(Validator({"inner": Inner()}))
+        errors = {}
+        model = {"inner": 0}
+        assert not v.validate(model, errors)
+        assert not v.validate(model, errors, [])
+        model["inner"] = 1
+        assert v.validate(model, errors, ["inner"])
+        assert {} == errors
+
+    def test_dotted_comparand(self):
+        """Fields that compare with a nested attribute are re-run."""
+
+        class Address(object):
+            zip = "1"
+
+        class User(object):
+            def __init__(self):
+                self.zip = "1"
+                self.address = Address()
+
+        validator = Validator({"zip": [compare(equal="address.zip")]})
+        for changed in (["address.zip"], ["address"], None):
+            u = User()
+            v = IncrementalValidator(validator)
+            errors = {}
+            assert v.validate(u, errors)
+            u.address.zip = "2"
+            assert not validator.validate(u, {})
+            assert not v.validate(u, errors, changed)
+            assert ["zip"] == list(errors)
+
+    def test_reset(self):
+        """Validates all fields after reset."""
+        v = IncrementalValidator(self.v)
+        v.validate(self.model, {})
+        v.reset()
+        v.validate(self.model, {}, [])
+        assert 2 == self.calls["age"]
+
+
+class DependenciesTestCase(unittest.TestCase):
+    def test_dependencies(self):
+        assert set() == dependencies([required, length(max=1)])
+        assert {"x"} == dependencies([and_(required, compare(equal="x"))])
+        assert {"x"} == dependencies([int_adapter(compare(not_equal="x"))])
+        assert set() == dependencies([compare()])
+        assert {"a.b"} == dependencies([compare(equal="a.b")])
+        assert dependencies([predicate(bool)]) is None
+        assert dependencies([must(bool), CustomRule()]) is None
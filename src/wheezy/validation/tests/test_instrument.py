@@ -0,0 +1,111 @@
+import unittest
+
+from wheezy.validation.adaptive import AdaptiveValidator
+from wheezy.validation.instrument import Instrumentation, rule_name
+from wheezy.validation.rules import length, must, required
+from wheezy.validation.validator import (
+    CollectionValidator,
+    OptionalValidator,
+    Validator,
+)
+
+user_validator = Validator({"name": [required, length(min=4)]})
+registration_validator = Validator(
+    {"user": user_validator, "terms": [must(bool)]}
+)
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    def test_same_results(self):
+        """Instrumented validator gives the same results."""
+        i = Instrumentation()
+        v = i.instrument(user_validator)
+        for name in ("", "abc", "john"):
+            for stop in (True, False):
+                expected = {}
+                results = {}
+                model = {"name": name}
+                succeed = user_validator.validate(model, expected, stop)
+                assert succeed == v.validate(model, results, stop)
+                assert expected == results
+
+    def test_report(self):
+        """Reports calls, failures and elapsed time per rule."""
+        i = Instrumentation()
+        v = i.instrument(registration_validator, "registration")
+        model = {"user": {"name": "abc"}, "terms": True}
+        for _ in range(3):
+            v.validate(model, {})
+        report = dict((key, (c, f)) for key, c, f, e in i.report())
+        assert {
+            ("registration", "terms", 0, "ValuePredicateRule"): (3, 0),
+            ("registration.user", "name", 0, "RequiredRule"): (3, 0),
+            ("registration.user", "name", 1, "LengthRule.check_min"): (3, 3),
+        } == report
+        assert all(e >= 0 for key, c, f, e in i.report())
+        fields = dict((key, (c, f)) for key, c, f, e in i.report_fields())
+        assert {
+            ("registration", "terms"): (3, 0),
+            ("registration.user", "name"): (3, 3),
+        } == fields
+        i.reset()
+        assert [] == i.report()
+
+    def test_nested(self):
+        """Rules of dotted names and nested wrappers are reported."""
+        i = Instrumentation()
+        v = i.instrument(
+            Validator(
+                {
+                    "user.name": [required],
+                    "lines": CollectionValidator(user_validator),
+                    "owner": OptionalValidator(user_validator),
+                }
+            ),
+            "order",
+        )
+        model = {
+            "user": {"name": ""},
+            "lines": [{"name": "john"}, {"name": "abc"}],
+            "owner": None,
+        }
+        errors = {}
+        assert not v.validate(model, errors, False)
+        assert ["lines[1].name", "user.name"] == sorted(errors)
+        model["owner"] = {"name": "john"}
+        v.validate(model, {})
+        report = dict((key, (c, f)) for key, c, f, e in i.report())
+        assert {
+            ("order", "user.name", 0, "RequiredRule"): (2, 2),
+            ("order.lines[]", "name", 0, "RequiredRule"): (4, 0),
+            ("order.lines[]", "name", 1, "LengthRule.check_min"): (4, 2),
+            ("order.owner", "name", 0, "RequiredRule"): (1, 0),
+            ("order.owner", "name", 1, "LengthRule.check_min"): (1, 0),
+        } == report
+
+    def test_subclass(self):
+        """Subclasses of validator are kept as is."""
+        i = Instrumentation()
+        adaptive = AdaptiveValidator({"name": [required]})
+        assert adaptive is i.instrument(adaptive)
+        v = i.instrument(Validator({"user": adaptive}))
+        assert adaptive is dict(v.inner)["user"]
+
+    def test_sample(self):
+        """Every n-th call is recorded, the report is estimated."""
+        i = Instrumentation(sample=2)
+        v = i.instrument(user_validator)
+        for _ in range(5):
+            v.validate({"name": "john"}, {})
+        assert [2 * 2, 2 * 2] == [c for key, c, f, e in i.report()]
+
+    def test_disabled(self):
+        """Nothing is recorded while disabled."""
+        i = Instrumentation(enabled=False)
+        v = i.instrument(user_validator)
+        assert not v.validate({"name": ""}, {})
+        assert [] == i.report()
+
+    def test_rule_name(self):
+        assert "RequiredRule" == rule_name(required)
+        assert "LengthRule.check_max" == rule_name(length(max=2))
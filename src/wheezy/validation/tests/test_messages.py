@@ -0,0 +1,167 @@
+import json
+import pickle
+import unittest
+
+from wheezy.validation.messages import (
+    ErrorCode,
+    LazyMessage,
+    MessageTemplate,
+    code_gettext,
+    lazy_gettext,
+    translate_errors,
+)
+from wheezy.validation.rules import email, length, or_, range, regex, required
+from wheezy.validation.validator import Validator
+
+
+class Translations(object):
+    def __init__(self):
+        self.calls = 0
+
+    def gettext(self, message):
+        self.calls += 1
+        return "* " + message
+
+
+class LazyMessageTestCase(unittest.TestCase):
+    def test_str(self):
+        """Message is translated and formatted on conversion to str."""
+        m = LazyMessage("%(min)d items", lambda s: "* " + s)
+        assert m is m % {"min": 1}
+        assert "* 1 items" == str(m)
+        assert "'* 1 items'" == repr(m)
+        assert "* 1 items" == m
+        assert m != "1 items"
+        assert hash("* 1 items") == hash(m)
+
+    def test_eq(self):
+        """Message is equal to str or another message only."""
+        m = LazyMessage("1", str)
+        assert m == LazyMessage("1", str)
+        assert m != LazyMessage("2", str)
+        assert m != 1
+        assert not m == 1
+        assert m != ["1"]
+
+    def test_pickle(self):
+        """Message is pickled as str."""
+        m = LazyMessage("x", lambda s: "* " + s)
+        assert "* x" == pickle.loads(pickle.dumps(m))
+
+
+class LazyGettextTestCase(unittest.TestCase):
+    def test_validate(self):
+        """Validation errors are translated on demand."""
+        t = Translations()
+        v = Validator(
+            {
+                "name": [required, length(min=4)],
+                "code": [or_(length(max=1), length(min=3, max=3))],
+            }
+        )
+        errors = {}
+        assert not v.validate(
+            {"name": "", "code": "ab"},
+            errors,
+            stop=False,
+            gettext=lazy_gettext(t),
+        )
+        assert 0 == t.calls
+        assert ["name", "code"] == list(errors)
+        assert "* Required to be a minimum of 4 characters in length." == (
+            errors["name"][1]
+        )
+        assert 1 == t.calls
+        errors = json.loads(json.dumps(errors, default=str))
+        assert "* Exceeds maximum length of 1." == errors["code"][0]
+
+    def test_null_translations(self):
+        """Messages are not translated by default."""
+        v = Validator({"name": [required]})
+        errors = {}
+        v.validate({"name": ""}, errors, gettext=lazy_gettext())
+        assert required.message_template == errors["name"][0]
+
+
+class ErrorCodeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.v = Validator(
+            {
+                "name": [required, length(max=3)],
+                "email": [email],
+                "age": [range(min=18)],
+                "code": [regex(r"\d+", message_template="Digits only.")],
+            }
+        )
+        self.model = {"name": "john", "email": "x", "age": 5, "code": "x"}
+
+    def test_codes(self):
+        """Rules report error codes with format arguments."""
+        errors = {}
+        assert not self.v.validate(self.model, errors, gettext=code_gettext)
+        assert {
+            "name": [("length.max", {"max": 3})],
+            "email": [("email", None)],
+            "age": [("range.min", {"min": 18})],
+            "code": [("regex", None)],
+        } == errors
+        assert '{"name": [["length.max", {"max": 3}]]}' == json.dumps(
+            {"name": errors["name"]}, default=list
+        )
+
+    def test_translate_errors(self):
+        """Error codes are translated on demand."""
+        errors = {}
+        self.v.validate(self.model, errors, gettext=code_gettext)
+        errors["__ERROR__"] = ["Plain message."]
+        expected = {}
+        self.v.validate(self.model, expected, translations=Translations())
+        expected["__ERROR__"] = ["Plain message."]
+        assert expected == translate_errors(errors, Translations())
+        assert (
+            "* Digits only."
+            == translate_errors(errors, Translations())["code"][0]
+        )
+
+    def test_custom_template(self):
+        """A template without code is used as code."""
+        e = code_gettext("Custom error.")
+        assert ("Custom error.", None) == e
+        assert "Custom error." == e.translate(str)
+        e = ErrorCode("length.max", "Max %(max)d.") % {"max": 3}
+        assert "ErrorCode('length.max', {'max': 3})" == repr(e)
+        assert hash(e) == hash("length.max")
+
+    def test_eq(self):
+        """Error code is equal to error code, tuple or list only."""
+        e = ErrorCode("length.max", "Max %(max)d.", {"max": 3})
+        assert e == ErrorCode("length.max", "Max.", {"max": 3})
+        assert e == ("length.max", {"max": 3})
+        assert e == ["length.max", {"max": 3}]
+        assert e != ("length.min", {"max": 3})
+        assert e != 1
+        assert not e == 1
+        assert e != "ab"
+        assert e != {"length.max": 1, "x": 2}
+
+    def test_hash(self):
+        """Error code hashes the same as an equal tuple."""
+        e = ErrorCode("required", "Required.")
+        assert hash(("required", None)) == hash(e)
+        assert 1 == len({e, ("required", None)})
+        assert ("required", None) in {e: 1}
+        e = ErrorCode("range.min", "Min.", (1,))
+        assert hash(("range.min", (1,))) == hash(e)
+        e = ErrorCode("length.max", "Max %(max)d.", {"max": 3})
+        assert hash(e) == hash(ErrorCode("length.max", "Max.", {"max": 3}))
+
+    def test_pickle(self):
+        """Templates and error codes survive pickle."""
+        t = pickle.loads(pickle.dumps(MessageTemplate("required", "Req.")))
+        assert "required" == t.code
+        assert "Req." == t
+        e = ErrorCode("length.max", "Max %(max)d.", {"max": 3})
+        e = pickle.loads(pickle.dumps(e))
+        assert "Max 3." == e.translate(str)
+        m = LazyMessage("Req.", str)
+        assert m is MessageTemplate("x", m)
@@ -1,18 +1,29 @@
+import gc
 import unittest
 from datetime import date, datetime, time
 from decimal import Decimal
+from gettext import NullTranslations
 
+from wheezy.validation import model
+from wheezy.validation.i18n import clear_gettext_cache
 from wheezy.validation.model import (
+    bind_value_providers,
     bool_value_provider,
     boolean_true_values,
     bytes_value_provider,
+    clear_binding_plans,
     date_value_provider,
     datetime_value_provider,
     float_value_provider,
+    input_matcher,
+    input_parser,
+    input_parsers,
     int_value_provider,
+    locale_value_providers,
     str_value_provider,
     time_value_provider,
     try_update_model,
+    try_update_models,
 )
 
 
@@ -87,6 +98,279 @@ class TryUpdateModelTestCase(unittest.TestCase):
         assert date.min == user.birthday
         assert [0] == user.prefs2
 
+    def test_binding_plan(self):
+        """Binding plan is cached per model class."""
+        from wheezy.validation import model
+
+        clear_binding_plans()
+        assert try_update_model(User(), self.values, {})
+        assert User in model.binding_plans
+        user = User()
+        assert try_update_model(user, self.values, {})
+        assert 33 == user.age
+        clear_binding_plans(User)
+        assert User not in model.binding_plans
+
+    def test_binding_plan_differs(self):
+        """Attributes that differ from the plan are bound as usual."""
+        clear_binding_plans()
+        assert try_update_model(User(), {}, {})
+        user = User()
+        user.age = "0"
+        user.prefs2 = []
+        assert try_update_model(user, self.values, {})
+        assert "33" == user.age
+        assert ["1", "2"] == user.prefs2
+        user = User()
+        user.extra = 0
+        assert try_update_model(user, {"extra": "1"}, {})
+        assert 1 == user.extra
+
+    def test_binding_plan_missing_attribute(self):
+        """Attributes a model does not have are skipped."""
+
+        class Model(object):
+            def __init__(self, extra=False):
+                if extra:
+                    self.extra = extra
+
+        assert try_update_model(Model(extra=True), {"extra": "1"}, {})
+        model = Model()
+        assert try_update_model(model, {"extra": "1"}, {})
+        assert not hasattr(model, "extra")
+
+    def test_binding_plan_property(self):
+        """Properties are not read unless there is a value."""
+
+        class Model(object):
+            age = 0
+
+            @property
+            def total(self):
+                raise RuntimeError("not computed yet")
+
+        model = Model()
+        assert try_update_model(model, {"age": "1"}, {})
+        assert 1 == model.age
+
+    def test_binding_plan_evicted(self):
+        """Binding plan is evicted with model class."""
+        from wheezy.validation import model
+
+        t = type("Dynamic", (object,), {"age": 0})
+        assert try_update_model(t(), {"age": "1"}, {})
+        size = len(model.binding_plans)
+        del t
+        gc.collect()
+        assert size - 1 == len(model.binding_plans)
+
+
+class TryUpdateModelsTestCase(unittest.TestCase):
+    def test_dict_rows(self):
+        """Each row updates a fresh model."""
+        rows = [{"age": "33", "prefs2": ["1"]}, {"age": "x"}, {}]
+        results = list(try_update_models(User, rows))
+        assert [33, 0, 0] == [model.age for model, errors in results]
+        assert [1] == results[0][0].prefs2
+        assert [0] == results[1][0].prefs2
+        assert [[], ["age"], []] == [list(e) for m, e in results]
+
+    def test_header(self):
+        """Rows are sequences of values in the header order."""
+        rows = [("john", "33", "x"), ("alice", "x", "y")]
+        results = list(try_update_models(User, rows, ("name", "age", "z")))
+        assert ["john", "alice"] == [model.name for model, errors in results]
+        assert 33 == results[0][0].age
+        assert {"age": ["Input was not in a correct format."]} == results[1][1]
+
+    def test_dict_model(self):
+        """Dict models are updated by their keys."""
+        rows = [{"name": "john", "age": "1"}]
+        ((model, errors),) = try_update_models(lambda: {"name": ""}, rows)
+        assert {"name": "john"} == model
+        assert {} == errors
+
+    def test_lazy(self):
+        """Rows are read as results are consumed."""
+        read = []
+
+        def rows():
+            for age in ("1", "2"):
+                read.append(age)
+                yield {"age": age}
+
+        results = try_update_models(User, rows())
+        assert 1 == next(results)[0].age
+        assert ["1"] == read
+
+
+class InputParserTestCase(unittest.TestCase):
+    def test_parse(self):
+        """Values are parsed the same way as by strptime."""
+        from time import strptime
+
+        for fmt, value in (
+            ("%Y/%m/%d", "2012/2/4"),
+            ("%m/%d/%y", "02/04/12"),
+            ("%m/%d/%y", "2/4/69"),
+            ("%Y/%m/%d  %H:%M:%S", "2012/02/04 \t16:14:52"),
+            ("%m%d", "0229"),
+            ("%H:%M%%", "16:14%"),
+            ("%d.%m.%Y", " 4.2.2012"),
+        ):
+            assert list(strptime(value, fmt)[:6]) == list(
+                input_parser(fmt)(value)
+            )
+
+    def test_invalid(self):
+        """ValueError is raised for input that strptime rejects."""
+        for fmt, value in (
+            ("%Y/%m/%d", "2012/2/30"),
+            ("%Y/%m/%d", "2012/2/4 "),
+            ("%Y/%m/%d", "12/2/4"),
+            ("%H:%M", "24:00"),
+            ("%m%d", "1332"),
+        ):
+            self.assertRaises(ValueError, input_parser(fmt), value)
+
+    def test_fallback(self):
+        """Unsupported directives are parsed by strptime."""
+        parse = input_parser("%d %b %Y")
+        assert [2012, 2, 4, 0, 0, 0] == list(parse("4 Feb 2012"))
+        self.assertRaises(ValueError, input_parser("%Y%"), "2012")
+
+    def test_cached(self):
+        """Parsers are cached per format."""
+        assert input_parser("%Y/%m/%d") is input_parser("%Y/%m/%d")
+        parsers = input_parsers("%Y/%m/%d|%H:%M")
+        assert parsers is input_parsers("%Y/%m/%d|%H:%M")
+        assert input_parser("%H:%M") is parsers[1]
+
+
+class InputMatcherTestCase(unittest.TestCase):
+    def test_match(self):
+        """The first format that value matches is used."""
+        match = input_matcher("%Y/%m/%d %H:%M|%Y/%m/%d %H:%M:%S|%m/%d/%y")
+        assert [2012, 2, 4, 16, 14, 0] == match("2012/2/4 16:14", list)
+        assert [2012, 2, 4, 16, 14, 52] == match("2012/2/4 16:14:52", list)
+        assert [2012, 2, 4, 0, 0, 0] == match("2/4/12", list)
+        self.assertRaises(ValueError, match, "2012/2/30 16:14", list)
+        self.assertRaises(ValueError, match, "x", list)
+
+    def test_convert(self):
+        """Next format is tried if convert rejects the result."""
+
+        def convert(result):
+            if result[1] == 1:
+                raise ValueError()
+            return result
+
+        match = input_matcher("%m/%d|%d/%m")
+        assert [1900, 2, 1, 0, 0, 0] == match("1/2", convert)
+        self.assertRaises(ValueError, match, "1/1", convert)
+
+    def test_fallback(self):
+        """Formats are tried in turn if any directive is not supported."""
+        match = input_matcher("%d %b %Y|%Y/%m/%d")
+        assert [2012, 2, 4, 0, 0, 0] == list(match("4 Feb 2012", list))
+        assert [2012, 2, 4, 0, 0, 0] == match("2012/2/4", list)
+        self.assertRaises(ValueError, match, "x", list)
+
+    def test_cached(self):
+        """Matchers are cached per formats."""
+        assert input_matcher("%H:%M|%H:%M:%S") is input_matcher(
+            "%H:%M|%H:%M:%S"
+        )
+
+
+class LocaleValueProvidersTestCase(unittest.TestCase):
+    def test_bound(self):
+        """Separators and formats are resolved once per locale."""
+        calls = []
+
+        def gettext(message):
+            calls.append(message)
+            return {",": " ", ".": ",", "%Y/%m/%d": "%d.%m.%Y"}.get(
+                message, message
+            )
+
+        providers = bind_value_providers(gettext)
+        n = len(calls)
+        assert 1001 == providers["int"]("1 001", None)
+        assert Decimal("1.5") == providers["Decimal"]("1,5", None)
+        assert 1.5 == providers["float"]("1,5", None)
+        assert date(2012, 2, 4) == providers["date"]("4.2.2012", None)
+        assert time(16, 14) == providers["time"]("16:14", None)
+        assert datetime(2012, 2, 4) == providers["datetime"]("4.2.2012", None)
+        assert n == len(calls)
+        assert providers["int"] is not int_value_provider
+        assert providers["str"] is str_value_provider
+
+    def test_custom(self):
+        """Custom providers are kept and picked up once added."""
+
+        def vp(value, gettext):
+            return "x" + value
+
+        assert {"x": vp} == bind_value_providers(str, {"x": vp})
+        assert locale_value_providers() is locale_value_providers(None)
+
+        model.value_providers["custom"] = vp
+        try:
+            assert vp is locale_value_providers()["custom"]
+        finally:
+            del model.value_providers["custom"]
+
+    def test_cached(self):
+        """Bound providers are cached per translations."""
+
+        class Translations(object):
+            def gettext(self, message):
+                return message
+
+        t = Translations()
+        providers = locale_value_providers(t)
+        assert providers is locale_value_providers(t)
+        clear_binding_plans()
+        assert providers is not locale_value_providers(t)
+
+    def test_fallback(self):
+        """Bound providers are rebuilt once gettext cache is cleared."""
+
+        class Fallback(NullTranslations):
+            def gettext(self, message):
+                return {",": " ", ".": ","}.get(message, message)
+
+        t = NullTranslations()
+        m = {"amount": Decimal(0)}
+        assert try_update_model(m, {"amount": ["1.5"]}, {}, t)
+        assert Decimal("1.5") == m["amount"]
+        t.add_fallback(Fallback())
+        clear_gettext_cache()
+        assert try_update_model(m, {"amount": ["1 001,5"]}, {}, t)
+        assert Decimal("1001.5") == m["amount"]
+
+    def test_replaced(self):
+        """A provider replaced after first use is picked up."""
+
+        def vp(value, gettext):
+            return "custom: " + value
+
+        user = {"name": ""}
+        assert try_update_model(user, {"name": ["a"]}, {})
+        assert "a" == user["name"]
+        original = model.value_providers["str"]
+        version = model.value_providers.version
+        model.value_providers["str"] = vp
+        try:
+            assert version != model.value_providers.version
+            assert try_update_model(user, {"name": ["a"]}, {})
+            assert "custom: a" == user["name"]
+        finally:
+            model.value_providers["str"] = original
+        assert try_update_model(user, {"name": ["a"]}, {})
+        assert "a" == user["name"]
+
 
 class ValueProviderTestCase(unittest.TestCase):
     def test_bytes_value_provider(self):
@@ -259,3 +543,17 @@ class User(object):
 
 
 hello = "\u043f\u0440\u0438\u0432\u0456\u0442"
+
+
+class WarmupTestCase(unittest.TestCase):
+    def test_warmup(self):
+        """Deferred work is done on warmup."""
+        from wheezy import validation
+        from wheezy.validation import model, rules
+
+        validation.warmup()
+        assert validation.try_update_model is try_update_model
+        assert model.strptime is model.time_strptime
+        assert rules.email.regex.search("x@somewhere.net")
+        assert rules.email.regex.search != rules.email.regex.compile_and_search
+        self.assertRaises(AttributeError, getattr, validation, "x")
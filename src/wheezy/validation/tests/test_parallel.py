@@ -0,0 +1,70 @@
+import unittest
+
+from wheezy.validation.parallel import (
+    ParallelValidator,
+    translate_templates,
+    validate_parallel,
+)
+from wheezy.validation.rules import and_, length, required
+from wheezy.validation.validator import Validator
+
+user_validator = Validator(
+    {"name": [required, and_(length(min=2), length(max=5))]}
+)
+
+registration_validator = Validator(
+    {"user": user_validator, "terms": [required]}
+)
+
+
+def make_models(size):
+    names = ["john", "", "x", "alice", "bartholomew"]
+    return [{"name": names[i % len(names)]} for i in range(size)]
+
+
+class ParallelValidatorTestCase(unittest.TestCase):
+    def test_inline(self):
+        """Models that fit in a single chunk are validated inline."""
+        models = make_models(10)
+        v = ParallelValidator(user_validator, chunk_size=10)
+        errors = v.validate_many(models)
+        assert v.executor is None
+        assert user_validator.validate_many(models) == errors
+
+    def test_chunks(self):
+        """Results are merged in order of models."""
+        models = make_models(103)
+        with ParallelValidator(
+            user_validator, stop=False, chunk_size=10, max_workers=2
+        ) as v:
+            errors = v.validate_many(models)
+            assert v.executor is not None
+            assert user_validator.validate_many(models, False) == errors
+            failed = v.validate_many(models, indices_only=True)
+            assert sorted(errors) == failed
+        assert v.executor is None
+
+    def test_translations(self):
+        """Message templates are translated once for workers."""
+
+        class Translations(object):
+            def gettext(self, message):
+                return "* " + message
+
+        errors = validate_parallel(
+            user_validator,
+            make_models(20),
+            translations=Translations(),
+            chunk_size=5,
+            max_workers=2,
+        )
+        assert "* Required field cannot be left blank." == errors[1]["name"][0]
+
+
+class TranslateTemplatesTestCase(unittest.TestCase):
+    def test_nested(self):
+        """Templates of nested validators and rules are collected."""
+        catalog = translate_templates(registration_validator, str.upper)
+        assert 3 == len(catalog)
+        for template, message in catalog.items():
+            assert template.upper() == message
@@ -1,16 +1,20 @@
+import pickle
 import re
 import unittest
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from wheezy.validation.messages import code_gettext
 from wheezy.validation.rules import (
     AndRule,
     Base64Rule,
+    CachedRule,
     CompareRule,
     EmailRule,
     IgnoreRule,
     IntAdapterRule,
     IteratorRule,
+    LazyPattern,
     LengthRule,
     MissingRule,
     NotNoneRule,
@@ -34,6 +38,7 @@ from wheezy.validation.rules import (
     ValuePredicateRule,
     and_,
     base64,
+    cached,
     compare,
     email,
     empty,
@@ -66,6 +71,7 @@ from wheezy.validation.rules import (
     urlsafe_base64,
     value_predicate,
 )
+from wheezy.validation.validator import Validator
 
 
 class RulesTestCase(unittest.TestCase):
@@ -293,6 +299,18 @@ class RulesTestCase(unittest.TestCase):
         assert not v("x")
         assert errors
 
+    def test_compare_dotted(self):
+        """Test `compare` rule with dotted comparand."""
+        errors = []
+        m = {"previous": {"password": "x"}}
+        r = compare(not_equal="previous.password")
+
+        def v(i):
+            return r.validate(i, None, m, errors, lambda s: s)
+
+        assert v("z")
+        assert not v("x")
+
     def test_predicate(self):
         """Test `predicate` rule strategy."""
         # shortcut
@@ -354,6 +372,23 @@ class RulesTestCase(unittest.TestCase):
         assert not v("x")
         assert errors
 
+    def test_lazy_pattern(self):
+        """Pattern is compiled on first search."""
+        p = LazyPattern(r"^[a-z]+$", re.IGNORECASE)
+        assert p.search == p.compile_and_search
+        assert p.search("Abc")
+        assert p.search == re.compile(r"^[a-z]+$", re.IGNORECASE).search
+        assert not p.search("1")
+        p = pickle.loads(pickle.dumps(p))
+        assert p.search("Abc")
+        assert p.match("Abc")
+        assert isinstance(email.regex, LazyPattern)
+
+    def test_regex_eager(self):
+        """Patterns passed to `regex` are compiled immediately."""
+        assert regex(r"\d+").regex.fullmatch("12")
+        self.assertRaises(re.error, regex, "(")
+
     def test_regex_check_not_found(self):
         """Test `regex` rule strategy check_not_found."""
         errors = []
@@ -722,6 +757,82 @@ class RulesTestCase(unittest.TestCase):
         assert errors
 
 
+class CachedRuleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def is_known(value):
+            self.calls.append(value)
+            return value in ("UA", "PL")
+
+        self.r = cached(must(is_known, "Unknown %(value)s."), max_size=2)
+
+    def v(self, value, gettext=lambda s: s):
+        result = []
+        return self.r.validate(value, None, None, result, gettext), result
+
+    def test_hits(self):
+        """Outcome is computed once per value."""
+        assert cached == CachedRule
+        assert (True, []) == self.v("UA")
+        assert (False, ["Unknown %(value)s."]) == self.v("XX")
+        assert (True, []) == self.v("UA")
+        assert (False, ["* Unknown %(value)s."]) == self.v(
+            "XX", lambda s: "* " + s
+        )
+        assert ["UA", "XX"] == self.calls
+        assert (2, 2) == (self.r.hits, self.r.misses)
+        assert [("value_predicate", None)] == self.v("XX", code_gettext)[1]
+
+    def test_custom_rule(self):
+        """Messages of a custom rule are str and not cached."""
+        calls = []
+
+        class Custom(object):
+            def validate(self, value, name, model, result, gettext):
+                calls.append(value)
+                if value:
+                    return True
+                result.append(gettext("Field %s is bad.").replace("%s", name))
+                return False
+
+        r = cached(Custom())
+        v = Validator({"name": [r]})
+        for value in ("", "x", ""):
+            errors = {}
+            assert bool(value) == v.validate({"name": value}, errors)
+            assert value or {"name": ["Field name is bad."]} == errors
+        assert v.validate({"name": "x"}, {})
+        errors = {}
+        assert not v.validate({"name": ""}, errors, gettext=lambda s: "* " + s)
+        assert {"name": ["* Field name is bad."]} == errors
+        assert ["", "x", "", ""] == calls
+
+    def test_eviction(self):
+        """Least recently used values are evicted."""
+        for value in ("UA", "PL", "UA", "XX", "UA", "PL"):
+            self.v(value)
+        assert ["UA", "PL", "XX", "PL"] == self.calls
+        assert 2 == len(self.r.cache)
+        self.r.clear()
+        assert (0, 0, 0) == (len(self.r.cache), self.r.hits, self.r.misses)
+
+    def test_not_hashable(self):
+        """Values that are not hashable are not cached."""
+        assert (False, ["Unknown %(value)s."]) == self.v(["UA"])
+        self.v(["UA"])
+        assert 2 == len(self.calls)
+        self.v(1)
+        self.v(True)
+        assert [["UA"], ["UA"], 1, True] == self.calls
+
+    def test_pickle(self):
+        """Cache is not pickled."""
+        r = pickle.loads(pickle.dumps(cached(email)))
+        assert not r.cache
+        assert not r.validate("x", None, None, [], lambda s: s)
+
+
 class RelativeDeltaRuleMixin(object):
     def test_shortcut(self):
         """Test rule shortcut."""
@@ -0,0 +1,142 @@
+import unittest
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Annotated, List, Optional
+
+from wheezy.validation.rules import IteratorRule, length, range, required
+from wheezy.validation.schema import Schema
+from wheezy.validation.validator import (
+    CollectionValidator,
+    OptionalValidator,
+    Validator,
+)
+
+
+@dataclass
+class Address:
+    city: Annotated[str, required, length(max=10)] = ""
+
+
+@dataclass
+class Line:
+    quantity: Annotated[int, range(min=1)] = 0
+
+
+@dataclass
+class User:
+    name: Annotated[str, required] = ""
+    address: Optional[Address] = None
+
+
+@dataclass
+class Node:
+    children: list["Node"] = field(default_factory=list)
+
+
+@dataclass
+class Order:
+    name: Annotated[str, required] = ""
+    total: Optional[Annotated[int, range(min=0)]] = None
+    placed: Annotated[Optional[date], required] = None
+    tags: List[Annotated[str, length(max=3)]] = field(default_factory=list)
+    codes: list[int] = field(default_factory=list)
+    address: Address = field(default_factory=Address)
+    lines: list[Line] = field(default_factory=list)
+    note: str = ""
+
+
+@dataclass
+class Shipment:
+    lines: Annotated[list[Line], length(max=1)] = field(default_factory=list)
+    main: Annotated[Optional[Line], required] = None
+
+
+class SchemaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.schema = Schema(Order)
+
+    def test_validator(self):
+        """Rules are taken from annotations."""
+        v = self.schema.validator
+        rules = dict(v.rules)
+        assert ["name", "placed", "tags", "total"] == sorted(rules)
+        assert isinstance(rules["tags"][0], IteratorRule)
+        inner = dict(v.inner)
+        assert isinstance(inner["address"], Validator)
+        assert isinstance(inner["lines"], CollectionValidator)
+
+    def test_validate(self):
+        """Compiled validator gives the same results."""
+        model = Order(total=-1, tags=["abcd"], lines=[Line(1), Line(0)])
+        expected = {}
+        results = {}
+        assert not self.schema.validator.validate(model, expected)
+        assert not self.schema.validate(model, results)
+        assert expected == results
+        assert ["lines[1].quantity"] == [k for k in results if "." in k]
+        assert "city" in results
+
+    def test_update_model(self):
+        """Values are converted by the plan of value providers."""
+        model = Order()
+        results = {}
+        assert self.schema.update_model(
+            model,
+            {
+                "name": [" john "],
+                "total": "10",
+                "placed": "2012/2/4",
+                "tags": ["a", "b"],
+                "codes": ["1", "2"],
+                "address": {"city": "Kyiv"},
+                "unknown": "x",
+            },
+            results,
+        )
+        assert not results
+        assert "john" == model.name
+        assert 10 == model.total
+        assert date(2012, 2, 4) == model.placed
+        assert [1, 2] == model.codes
+        assert "Kyiv" == model.address.city
+
+    def test_update_model_errors(self):
+        """Conversion errors are reported."""
+        model = Order()
+        results = {}
+        assert not self.schema.update_model(
+            model, {"total": "x", "codes": ["1", "x"]}, results
+        )
+        assert ["Input was not in a correct format."] == results["total"]
+        assert ["Multiple input was not in a correct format."] == results[
+            "codes"
+        ]
+
+    def test_optional_nested(self):
+        """Optional nested dataclass is not validated if None."""
+        schema = Schema(User)
+        assert isinstance(
+            dict(schema.validator.inner)["address"], OptionalValidator
+        )
+        for validate in (schema.validator.validate, schema.validate):
+            errors = {}
+            assert validate(User(name="x"), errors)
+            assert not errors
+            assert not validate(User(name="x", address=Address()), errors)
+            assert ["city"] == list(errors)
+
+    def test_nested_rules(self):
+        """Rules of a nested dataclass field are applied as well."""
+        schema = Schema(Shipment)
+        for validate in (schema.validator.validate, schema.validate):
+            errors = {}
+            assert not validate(Shipment(lines=[Line(1)] * 3), errors)
+            assert ["lines", "main"] == sorted(errors)
+            errors = {}
+            assert not validate(Shipment([Line(0)], Line(1)), errors)
+            assert ["lines[0].quantity"] == list(errors)
+            assert validate(Shipment([Line(1)], Line(1)), {})
+
+    def test_recursive(self):
+        """Recursive dataclass is rejected."""
+        self.assertRaises(TypeError, Schema, Node)
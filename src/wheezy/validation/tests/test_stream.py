@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+
+from wheezy.validation import stream
+from wheezy.validation.rules import length, required
+from wheezy.validation.stream import main, validate_lines, validate_stream
+from wheezy.validation.validator import Validator
+
+user_validator = Validator({"name": [required, length(max=5)]})
+
+
+class User(object):
+    def __init__(self):
+        self.name = ""
+        self.age = 0
+
+
+LINES = [
+    '{"name": "john", "age": "25"}\n',
+    "\n",
+    '{"name": ""}\n',
+    "not json\n",
+    '{"name": "alice", "age": "x"}\n',
+    "[1, 2]\n",
+]
+
+
+class ValidateLinesTestCase(unittest.TestCase):
+    def test_records(self):
+        """Records are validated as is, blank lines are skipped."""
+        records = list(validate_lines(user_validator, LINES))
+        assert [1, 3, 4, 5, 6] == [n for n, model, errors in records]
+        assert ({"name": "john", "age": "25"}, {}) == records[0][1:]
+        errors = [errors for n, model, errors in records]
+        assert ["Required field cannot be left blank."] == errors[1]["name"]
+        assert ["Input was not in a correct format."] == errors[2]["__ERROR__"]
+        assert {} == errors[3]
+        assert errors[4]
+
+    def test_model_factory(self):
+        """Records are converted into models first."""
+        records = list(validate_lines(user_validator, LINES, User))
+        model = records[0][1]
+        assert isinstance(model, User)
+        assert 25 == model.age
+        assert {"age": ["Input was not in a correct format."]} == records[3][2]
+
+    def test_lazy(self):
+        """Lines are read as results are consumed."""
+        read = []
+
+        def lines():
+            for line in LINES:
+                read.append(line)
+                yield line
+
+        records = validate_lines(user_validator, lines())
+        next(records)
+        assert 1 == len(read)
+
+
+class ValidateStreamTestCase(unittest.TestCase):
+    def test_outputs(self):
+        """Valid lines and error records are written separately."""
+        valid_output = StringIO()
+        error_output = StringIO()
+        assert (2, 3) == validate_stream(
+            user_validator, LINES, valid_output, error_output
+        )
+        assert (
+            '{"name": "john", "age": "25"}\n{"name": "alice", "age": "x"}\n'
+            == valid_output.getvalue()
+        )
+        errors = [
+            json.loads(line)
+            for line in error_output.getvalue().split("\n")
+            if line
+        ]
+        assert [3, 4, 6] == [e["line"] for e in errors]
+        assert {"name": ""} == errors[0]["record"]
+        assert "not json" == errors[1]["record"]
+        assert [1, 2] == errors[2]["record"]
+
+    def test_parsed_once(self):
+        """Each line is parsed as JSON once."""
+        calls = []
+        loads = stream.loads
+
+        def counted_loads(s):
+            calls.append(s)
+            return loads(s)
+
+        stream.loads = counted_loads
+        try:
+            validate_stream(user_validator, LINES, StringIO(), StringIO())
+        finally:
+            stream.loads = loads
+        assert [line for line in LINES if line.strip()] == calls
+
+    def test_main(self):
+        """Command line reads and writes files."""
+        with tempfile.TemporaryDirectory() as d:
+            self.check_main(d)
+
+    def check_main(self, d):
+        path = os.path.join(d, "input.jsonl")
+        with open(path, "w") as f:
+            f.writelines(LINES)
+        valid_path = os.path.join(d, "valid.jsonl")
+        errors_path = os.path.join(d, "errors.jsonl")
+        status = main(
+            [
+                "wheezy.validation.tests.test_stream.user_validator",
+                path,
+                "--model",
+                "wheezy.validation.tests.test_stream.User",
+                "--valid",
+                valid_path,
+                "--errors",
+                errors_path,
+            ]
+        )
+        assert 1 == status
+        with open(valid_path) as f:
+            assert [LINES[0]] == f.readlines()
+        with open(errors_path) as f:
+            assert 4 == len(f.readlines())
@@ -1,7 +1,13 @@
+import asyncio
 import unittest
 
+from wheezy.validation.parallel import ParallelValidator
 from wheezy.validation.rules import length, required
-from wheezy.validation.validator import Validator
+from wheezy.validation.validator import (
+    CollectionValidator,
+    OptionalValidator,
+    Validator,
+)
 
 
 class User(object):
@@ -79,3 +85,391 @@ class ValidatorTestCase(unittest.TestCase):
         u["name"] = "john"
         assert self.v.validate(u, errors)
         assert not errors
+
+
+class ValidateManyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.v = Validator({"name": [required, length(min=4)]})
+        self.models = [
+            {"name": "john"},
+            {"name": ""},
+            {"name": "abc"},
+            {"name": "alice"},
+        ]
+
+    def test_errors(self):
+        """Returns results of failed models by index."""
+        errors = self.v.validate_many(self.models)
+        assert [1, 2] == sorted(errors)
+        assert 1 == len(errors[1]["name"])
+        assert "Required to be a minimum" in errors[2]["name"][0]
+
+    def test_same_as_validate(self):
+        """Results are the same as validating each model."""
+        models = self.models + [User(), Registration().user]
+        for stop in (True, False):
+            errors = self.v.validate_many(models, stop)
+            for index, model in enumerate(models):
+                results = {}
+                if self.v.validate(model, results, stop):
+                    assert index not in errors
+                else:
+                    assert results == errors[index]
+
+    def test_nested(self):
+        """Nested validators are applied to each model."""
+        rv = Validator({"user": self.v})
+        r = Registration()
+        r.user.name = "john"
+        errors = rv.validate_many([Registration(), r])
+        assert [0] == list(errors)
+        assert ["name"] == list(errors[0])
+
+    def test_indices_only(self):
+        """Returns indices of failed models only."""
+        assert [1, 2] == self.v.validate_many(self.models, indices_only=True)
+        rv = Validator({"user": self.v})
+        r = Registration()
+        r.user.name = "john"
+        assert [1] == rv.validate_many([r, Registration()], indices_only=True)
+
+    def test_translations(self):
+        """Translations are used for error messages."""
+        errors = self.v.validate_many(self.models, gettext=lambda s: "* " + s)
+        assert errors[1]["name"][0].startswith("* ")
+
+
+class AsyncRule(object):
+    """Fails if value is not in `valid`, waits for `wait` event
+    and sets `done` event if any.
+    """
+
+    def __init__(self, valid, wait=None, done=None):
+        self.valid = valid
+        self.wait = wait
+        self.done = done
+
+    async def validate(self, value, name, model, result, gettext):
+        if self.done is not None:
+            self.done.set()
+        if self.wait is not None:
+            await self.wait.wait()
+        if value not in self.valid:
+            result.append(gettext("Unknown value."))
+            return False
+        return True
+
+
+class ValidateAsyncTestCase(unittest.TestCase):
+    def validate(self, validator, model, stop=True):
+        results = {}
+        succeed = asyncio.run(
+            asyncio.wait_for(validator.validate_async(model, results, stop), 1)
+        )
+        return succeed, results
+
+    def test_sync_rules(self):
+        """Sync rules give the same results as validate."""
+        v = Validator({"name": [required, length(min=4)]})
+        rv = Validator({"user": v})
+        for model in (User(), {"name": "abc"}, {"name": "john"}):
+            for stop in (True, False):
+                expected = {}
+                succeed = v.validate(model, expected, stop)
+                assert (succeed, expected) == self.validate(v, model, stop)
+        r = Registration()
+        assert (False, {"name": [required.message_template]}) == (
+            self.validate(rv, r)
+        )
+
+    def test_async_rules(self):
+        """Awaitable rules follow stop semantics per field."""
+        v = Validator(
+            {
+                "name": [required, AsyncRule(("john",)), length(max=4)],
+                "email": [AsyncRule(("x@y",))],
+            }
+        )
+        assert (True, {}) == self.validate(v, {"name": "john", "email": "x@y"})
+        succeed, results = self.validate(v, {"name": "", "email": "x@y"})
+        assert not succeed
+        assert [required.message_template] == results["name"]
+        succeed, results = self.validate(v, {"name": "j", "email": ""})
+        assert not succeed
+        assert ["Unknown value."] == results["name"]
+        assert ["Unknown value."] == results["email"]
+        succeed, results = self.validate(
+            v, {"name": "alice", "email": ""}, stop=False
+        )
+        assert 2 == len(results["name"])
+
+    def test_concurrent(self):
+        """Async rules of different fields run concurrently."""
+
+        async def validate():
+            a = asyncio.Event()
+            b = asyncio.Event()
+            v = Validator(
+                {
+                    "x": [AsyncRule((1,), wait=b, done=a)],
+                    "y": [AsyncRule((2,), wait=a, done=b)],
+                }
+            )
+            rv = Validator({"inner": v, "z": [AsyncRule((3,), wait=b)]})
+            results = {}
+            model = {"inner": {"x": 1, "y": 0}, "z": 3}
+            succeed = await asyncio.wait_for(
+                rv.validate_async(model, results), 1
+            )
+            return succeed, results
+
+        assert (False, {"y": ["Unknown value."]}) == asyncio.run(validate())
+
+
+class PathValidatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.v = Validator(
+            {
+                "name": [required],
+                "address.city": [required, length(max=5)],
+                "address.geo.zip": [required],
+            }
+        )
+
+    def test_dotted_names(self):
+        """Rules of dotted names are applied to nested attributes."""
+        errors = {}
+        model = {"name": "x", "address": {"city": "Kyiv", "geo": None}}
+        assert not self.v.validate(model, errors)
+        assert ["address.geo.zip"] == list(errors)
+        model["address"]["geo"] = Registration()
+        model["address"]["geo"].zip = "01001"
+        assert self.v.validate(model, {})
+        errors = {}
+        model["address"]["city"] = "Kyiv, Ukraine"
+        assert not self.v.is_valid(model, errors)
+        assert ["address.city"] == list(errors)
+        assert not self.v.is_valid({"name": "x", "address": None})
+
+
+class IsValidTestCase(unittest.TestCase):
+    def setUp(self):
+        self.v = Validator({"name": [required, length(min=4)]})
+        self.rv = Validator({"user": self.v, "terms": [required]})
+
+    def test_valid(self):
+        """Returns True if all rules pass."""
+        r = Registration()
+        r.user.name = "john"
+        r.terms = True
+        assert self.rv.is_valid(r)
+        errors = {}
+        assert self.rv.is_valid(r, errors)
+        assert not errors
+
+    def test_first_error(self):
+        """Stops on the first failed rule across nested validators."""
+        r = Registration()
+        r.terms = False
+        assert not self.rv.is_valid(r)
+        errors = {}
+        assert not self.rv.is_valid(r, errors)
+        assert ["terms"] == list(errors)
+        r.terms = True
+        errors = {}
+        assert not self.rv.is_valid(r, errors, gettext=lambda s: "* " + s)
+        assert {"name": ["* " + required.message_template]} == errors
+
+    def test_no_messages(self):
+        """No error messages are produced without results."""
+
+        def gettext(s):  # pragma: nocover
+            raise AssertionError(s)
+
+        v = Validator({"name": [length(min=4)]})
+        assert not v.is_valid({"name": "abc"}, gettext=gettext)
+
+    def test_custom_rule(self):
+        """Custom rules get gettext that returns str."""
+
+        class BadRule(object):
+            def validate(self, value, name, model, result, gettext):
+                result.append(gettext("Field %s is bad.").replace("%s", name))
+                return False
+
+        v = Validator({"name": [BadRule()]})
+        assert not v.is_valid({"name": ""})
+        errors = {}
+        assert not v.is_valid({"name": ""}, errors)
+        assert {"name": ["Field name is bad."]} == errors
+        v = Validator({"user.name": [BadRule()]})
+        assert not v.is_valid(Registration())
+
+    def test_inner_validate(self):
+        """Nested objects with validate only are supported."""
+
+        class Inner(object):
+            def validate(self, model, results, stop, translations, gettext):
+                results["inner"] = [gettext("x")]
+                return False
+
+        v = Validator({"inner": Inner()})
+        assert not v.is_valid({"inner": None})
+        errors = {}
+        assert not v.is_valid({"inner": None}, errors)
+        assert {"inner": ["x"]} == errors
+
+
+class CollectionValidatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.line_validator = Validator(
+            {"name": [required, length(max=5)], "sku": [required]}
+        )
+        self.lines = [
+            {"name": "apple" if i % 3 else "", "sku": "x" if i % 5 else ""}
+            for i in range(20)
+        ]
+
+    def test_index_keys(self):
+        """Errors of an item are reported with qualified keys."""
+        v = Validator({"lines": CollectionValidator(self.line_validator)})
+        errors = {}
+        assert not v.validate({"lines": self.lines}, errors)
+        assert 11 == len(errors)
+        assert ["Required field cannot be left blank."] == errors[
+            "lines[0].name"
+        ]
+        assert "lines[0].sku" in errors
+        assert "lines[3].name" in errors
+        assert "lines[5].sku" in errors
+        assert v.validate({"lines": []}, {})
+        assert v.validate({"lines": None}, {})
+
+    def test_chunks(self):
+        """Chunks give the same results as the whole."""
+        whole = Validator({"lines": CollectionValidator(self.line_validator)})
+        chunked = Validator(
+            {"lines": CollectionValidator(self.line_validator, chunk_size=3)}
+        )
+        expected = {}
+        errors = {}
+        whole.validate({"lines": self.lines}, expected, False)
+        chunked.validate({"lines": self.lines}, errors, False)
+        assert expected == errors
+
+    def test_max_failures(self):
+        """Validation stops after max_failures items failed."""
+        v = Validator(
+            {
+                "lines": CollectionValidator(
+                    self.line_validator, chunk_size=4, max_failures=2
+                )
+            }
+        )
+        errors = {}
+        assert not v.validate({"lines": self.lines}, errors)
+        assert ["lines[0].name", "lines[0].sku", "lines[3].name"] == sorted(
+            errors
+        )
+
+    def test_parallel(self):
+        """Chunks are validated by parallel validator."""
+        with ParallelValidator(
+            self.line_validator, chunk_size=5, max_workers=2
+        ) as p:
+            v = Validator(
+                {
+                    "lines": CollectionValidator(
+                        self.line_validator, chunk_size=10, parallel=p
+                    )
+                }
+            )
+            errors = {}
+            assert not v.validate({"lines": self.lines}, errors)
+        expected = {}
+        Validator(
+            {"lines": CollectionValidator(self.line_validator)}
+        ).validate({"lines": self.lines}, expected)
+        assert expected == errors
+
+    def test_parallel_translations(self):
+        """Errors of parallel validator are translated."""
+
+        class Translations(object):
+            def gettext(self, message):
+                return "t: " + message
+
+        t = Translations()
+        with ParallelValidator(
+            self.line_validator, t, chunk_size=5, max_workers=2
+        ) as p:
+            v = Validator(
+                {
+                    "lines": CollectionValidator(
+                        self.line_validator, max_failures=3, parallel=p
+                    )
+                }
+            )
+            errors = {}
+            assert not v.validate({"lines": self.lines}, errors, True, t)
+        assert [
+            "lines[0].name",
+            "lines[0].sku",
+            "lines[3].name",
+            "lines[5].sku",
+        ] == sorted(errors)
+        assert ["t: Required field cannot be left blank."] == errors[
+            "lines[0].name"
+        ]
+
+    def test_parallel_mismatch(self):
+        """Parallel validator of other stop or translations is rejected."""
+        with ParallelValidator(self.line_validator, max_workers=1) as p:
+            v = Validator(
+                {"lines": CollectionValidator(self.line_validator, parallel=p)}
+            )
+            assert not v.validate({"lines": self.lines}, {})
+            self.assertRaises(
+                ValueError, v.validate, {"lines": self.lines}, {}, False
+            )
+            self.assertRaises(
+                ValueError,
+                v.validate,
+                {"lines": self.lines},
+                {},
+                True,
+                None,
+                str,
+            )
+
+    def test_max_failures_invalid(self):
+        """At least one failure is required to stop."""
+        self.assertRaises(
+            ValueError, CollectionValidator, self.line_validator, 1000, 0
+        )
+
+    def test_is_valid(self):
+        """The first failed item is reported."""
+        v = Validator({"lines": CollectionValidator(self.line_validator)})
+        errors = {}
+        assert not v.is_valid({"lines": self.lines}, errors)
+        assert ["lines[0].name"] == list(errors)
+        assert not v.is_valid({"lines": self.lines})
+        assert v.is_valid({"lines": self.lines[1:3]})
+
+
+class OptionalValidatorTestCase(unittest.TestCase):
+    def test_none(self):
+        """Nested validator is applied unless value is None."""
+        v = Validator(
+            {"user": OptionalValidator(Validator({"name": [required]}))}
+        )
+        registration = Registration()
+        registration.user = None
+        for validate in (v.validate, v.is_valid, v.compile()):
+            errors = {}
+            assert validate(registration, errors)
+            registration.user = User()
+            assert not validate(registration, errors)
+            assert ["name"] == list(errors)
+            registration.user = None
@@ -1,8 +1,10 @@
-from gettext import NullTranslations
-
-from wheezy.validation.comp import ref_getter
-
-null_translations = NullTranslations()
+from wheezy.validation.comp import path_value, ref_getter
+from wheezy.validation.i18n import (  # noqa: F401
+    cached_gettext,
+    null_translations,
+    resolve_gettext,
+)
+from wheezy.validation.messages import null_gettext, null_result
 
 
 class Validator(object):
@@ -14,14 +16,26 @@ class Validator(object):
 
     def __init__(self, mapping):
         """Split `mapping` by one that holds iteratable of rules and
-        the other with nested validators.
+        the other with nested validators. A nested validator that has
+        `bind` method is replaced by one it returns for attribute name.
+
+        Rules of a dotted name, e.g. ``address.city``, are applied to
+        a nested attribute by `PathValidator`.
         """
         rules = []
         inner = []
         for name, value in mapping.items():
             if hasattr(value, "__iter__"):
+                if "." in name:
+                    inner.append(
+                        (name.split(".", 1)[0], PathValidator(name, value))
+                    )
+                    continue
                 rules.append((name, tuple(value)))
             else:
+                bind = getattr(value, "bind", None)
+                if bind is not None:
+                    value = bind(name)
                 inner.append((name, value))
         self.rules = tuple(rules)
         self.inner = tuple(inner)
@@ -37,10 +51,7 @@ class Validator(object):
         There is a way to internationalize validation errors with
         `translations` or `gettext`.
         """
-        if gettext is None:
-            if translations is None:
-                translations = null_translations
-            gettext = translations.gettext
+        gettext = resolve_gettext(translations, gettext)
         succeed = True
         getter = ref_getter(model)
         for name, rules in self.rules:
@@ -60,3 +71,468 @@ class Validator(object):
                 getter(model, name), results, stop, None, gettext
             )
         return succeed
+
+    def is_valid(self, model, results=None, translations=None, gettext=None):
+        """Returns `True` if given `model` passes all rules. Unlike
+        `validate` it returns `False` right after the first failed rule
+        across this and nested validators.
+
+        The error of the failed rule is stored in `results`, if
+        supplied, otherwise the error message is neither translated nor
+        kept.
+        """
+        if results is None:
+            gettext = null_gettext
+            result = null_result
+        elif gettext is None:
+            gettext = resolve_gettext(translations)
+        getter = ref_getter(model)
+        for name, rules in self.rules:
+            value = getter(model, name)
+            if results is not None:
+                result = []
+            for rule in rules:
+                if not rule.validate(value, name, model, result, gettext):
+                    if result:
+                        results[name] = result
+                    return False
+        for name, validator in self.inner:
+            value = getter(model, name)
+            if hasattr(validator, "is_valid"):
+                if not validator.is_valid(value, results, None, gettext):
+                    return False
+            elif not validator.validate(
+                value, {} if results is None else results, True, None, gettext
+            ):
+                return False
+        return True
+
+    async def validate_async(
+        self, model, results, stop=True, translations=None, gettext=None
+    ):
+        """Validates given `model` the same way `validate` does, except
+        a rule `validate` may return an awaitable (e.g. a coroutine).
+
+        Rules of a field run in order and the `stop` applies per field.
+        Sync rules run inline, once a rule of a field returns an
+        awaitable the rest of the field rules run concurrently with
+        other such fields and nested validators.
+        """
+        from asyncio import gather
+        from inspect import isawaitable
+
+        gettext = resolve_gettext(translations, gettext)
+        succeed = True
+        getter = ref_getter(model)
+        fields = []
+        pending = []
+        for name, rules in self.rules:
+            value = getter(model, name)
+            result = []
+            for i, rule in enumerate(rules):
+                rule_succeed = rule.validate(
+                    value, name, model, result, gettext
+                )
+                if isawaitable(rule_succeed):
+                    pending.append(
+                        validate_rules_async(
+                            rule_succeed,
+                            rules,
+                            i + 1,
+                            value,
+                            name,
+                            model,
+                            result,
+                            stop,
+                            gettext,
+                        )
+                    )
+                    break
+                succeed &= rule_succeed
+                if not rule_succeed and stop:
+                    break
+            fields.append((name, result))
+        for name, validator in self.inner:
+            value = getter(model, name)
+            if hasattr(validator, "validate_async"):
+                pending.append(
+                    validator.validate_async(
+                        value, results, stop, None, gettext
+                    )
+                )
+            else:
+                succeed &= validator.validate(
+                    value, results, stop, None, gettext
+                )
+        if pending:
+            for rule_succeed in await gather(*pending):
+                succeed &= rule_succeed
+        for name, result in fields:
+            if result:
+                results[name] = result
+        return succeed
+
+    def validate_many(
+        self,
+        models,
+        stop=True,
+        translations=None,
+        gettext=None,
+        indices_only=False,
+    ):
+        """Validates each model in `models` sequence. Returns a dict
+        that maps an index of model that failed validation to its
+        results, the models that succeed are not included.
+
+        With `indices_only` set `True` returns a list of indices of
+        models that failed validation. In this case validation of a
+        model stops on the first failed rule and no errors are kept.
+
+        The `translations` or `gettext` is resolved once per call.
+        """
+        gettext = resolve_gettext(translations, gettext)
+        if indices_only:
+            return failed_indices(self, models, gettext)
+        rules = self.rules
+        inner = self.inner
+        errors = {}
+        model_type = getter = None
+        results = {}
+        for index, model in enumerate(models):
+            if type(model) is not model_type:
+                model_type = type(model)
+                getter = ref_getter(model)
+            succeed = True
+            for name, field_rules in rules:
+                value = getter(model, name)
+                result = []
+                for rule in field_rules:
+                    if not rule.validate(value, name, model, result, gettext):
+                        succeed = False
+                        if stop:
+                            break
+                if result:
+                    results[name] = result
+            for name, validator in inner:
+                if not validator.validate(
+                    getter(model, name), results, stop, None, gettext
+                ):
+                    succeed = False
+            if not succeed:
+                errors[index] = results
+                results = {}
+            elif results:
+                results = {}
+        return errors
+
+    def compile(self):
+        """Returns a function specialized for this validator with
+        the same contract as `validate`. Field access, rule calls and
+        `stop` handling are unrolled, well known rules are inlined.
+
+        Rules are captured at the time of call, so the validator must
+        be compiled again to reflect any change made afterwards.
+        """
+        from wheezy.validation.compiler import compile_validator
+
+        return compile_validator(self)
+
+
+class CollectionValidator(object):
+    """Applies `validator` to each item of a list attribute. Errors of
+    an item are reported with keys qualified by attribute name and item
+    index, e.g. `lines[0].quantity`.
+
+    Items are validated in chunks of `chunk_size`, see
+    `Validator.validate_many`. Once `max_failures` items failed the
+    validation stops after the current chunk and only the first
+    `max_failures` failed items are reported. If `parallel`, a
+    `ParallelValidator` of the same `validator`, is supplied all items
+    are validated by it at once; its `stop` and `translations` must
+    match those of the caller.
+
+    Example::
+
+        order_validator = Validator({
+            'lines': CollectionValidator(line_validator, max_failures=10)
+        })
+    """
+
+    __slots__ = ("validator", "chunk_size", "max_failures", "parallel", "name")
+
+    def __init__(
+        self,
+        validator,
+        chunk_size=1000,
+        max_failures=None,
+        parallel=None,
+        name="",
+    ):
+        if max_failures is not None and max_failures < 1:
+            raise ValueError("max_failures must be at least 1")
+        self.validator = validator
+        self.chunk_size = chunk_size
+        self.max_failures = max_failures
+        self.parallel = parallel
+        self.name = name
+
+    def bind(self, name):
+        """Returns a copy of this validator for attribute `name`."""
+        return CollectionValidator(
+            self.validator,
+            self.chunk_size,
+            self.max_failures,
+            self.parallel,
+            name,
+        )
+
+    def validate(
+        self, value, results, stop=True, translations=None, gettext=None
+    ):
+        """Validates each item of `value` sequence, see
+        `Validator.validate`.
+        """
+        if not value:
+            return True
+        gettext = resolve_gettext(translations, gettext)
+        max_failures = self.max_failures
+        name = self.name
+        parallel = self.parallel
+        if parallel is not None:
+            check_parallel(parallel, stop, gettext)
+            return not report_failures(
+                parallel.validate_many(value),
+                0,
+                name,
+                results,
+                0,
+                max_failures,
+            )
+        validator = self.validator
+        chunk_size = self.chunk_size
+        size = len(value)
+        offsets = range(0, size, chunk_size)
+        bounds = range(chunk_size, size + chunk_size, chunk_size)
+        failures = 0
+        for i, j in zip(offsets, bounds):
+            errors = validator.validate_many(value[i:j], stop, None, gettext)
+            failures = report_failures(
+                errors, i, name, results, failures, max_failures
+            )
+            if failures == max_failures:
+                break
+        return not failures
+
+    def is_valid(self, value, results=None, translations=None, gettext=None):
+        """Returns `True` if each item of `value` sequence passes all
+        rules, see `Validator.is_valid`.
+        """
+        if not value:
+            return True
+        if results is not None and gettext is None:
+            gettext = resolve_gettext(translations)
+        validator = self.validator
+        for index, item in enumerate(value):
+            item_results = None if results is None else {}
+            if not validator.is_valid(item, item_results, None, gettext):
+                if item_results:
+                    prefix = "%s[%d]." % (self.name, index)
+                    for key, result in item_results.items():
+                        results[prefix + key] = result
+                return False
+        return True
+
+
+class OptionalValidator(object):
+    """Applies nested `validator` unless the value is `None`, e.g. for
+    an optional address of a user.
+
+    Example::
+
+        user_validator = Validator({
+            'address': OptionalValidator(address_validator)
+        })
+    """
+
+    __slots__ = ("validator",)
+
+    def __init__(self, validator):
+        self.validator = validator
+
+    def bind(self, name):
+        """Returns a copy of this validator for attribute `name`."""
+        bind = getattr(self.validator, "bind", None)
+        if bind is None:
+            return self
+        return OptionalValidator(bind(name))
+
+    def validate(
+        self, value, results, stop=True, translations=None, gettext=None
+    ):
+        """Validates `value` unless it is `None`, see
+        `Validator.validate`.
+        """
+        if value is None:
+            return True
+        return self.validator.validate(
+            value, results, stop, translations, gettext
+        )
+
+    def is_valid(self, value, results=None, translations=None, gettext=None):
+        """Returns `True` if `value` is `None` or passes all rules, see
+        `Validator.is_valid`.
+        """
+        if value is None:
+            return True
+        return self.validator.is_valid(value, results, translations, gettext)
+
+
+class PathValidator(object):
+    """Applies `rules` to a nested attribute addressed by dotted
+    `name`, e.g. ``address.city``. It is used as a nested validator
+    of the first part of `name`. The errors are reported with `name`
+    as a key. Rules get the object the attribute belongs to as a
+    model. If any part of the path is `None` the value is `None`.
+    """
+
+    __slots__ = ("name", "parents", "attribute", "rules")
+
+    def __init__(self, name, rules):
+        names = name.split(".")
+        self.name = name
+        self.parents = tuple(names[1:-1])
+        self.attribute = names[-1]
+        self.rules = tuple(rules)
+
+    def validate(
+        self, value, results, stop=True, translations=None, gettext=None
+    ):
+        """Validates the nested attribute of `value`, see
+        `Validator.validate`.
+        """
+        gettext = resolve_gettext(translations, gettext)
+        model, value = self.resolve(value)
+        name = self.name
+        succeed = True
+        result = []
+        for rule in self.rules:
+            if not rule.validate(value, name, model, result, gettext):
+                succeed = False
+                if stop:
+                    break
+        if result:
+            results[name] = result
+        return succeed
+
+    def is_valid(self, value, results=None, translations=None, gettext=None):
+        """Returns `True` if the nested attribute of `value` passes all
+        rules, see `Validator.is_valid`.
+        """
+        if results is None:
+            gettext = null_gettext
+            result = null_result
+        else:
+            result = []
+            gettext = resolve_gettext(translations, gettext)
+        model, value = self.resolve(value)
+        name = self.name
+        for rule in self.rules:
+            if not rule.validate(value, name, model, result, gettext):
+                if result:
+                    results[name] = result
+                return False
+        return True
+
+    def resolve(self, value):
+        """Returns the object the nested attribute belongs to and the
+        attribute value.
+        """
+        model = path_value(value, self.parents)
+        if model is None:
+            return None, None
+        return model, ref_getter(model)(model, self.attribute)
+
+
+# region: internal details
+
+
+def check_parallel(parallel, stop, gettext):
+    """Ensures `parallel` validator reports errors the same way as its
+    caller does with `stop` and `gettext`.
+    """
+    if parallel.stop != stop:
+        raise ValueError("parallel validator stop does not match")
+    translations = parallel.translations
+    if gettext != translations.gettext and gettext != cached_gettext(
+        translations
+    ):
+        raise ValueError("parallel validator translations do not match")
+
+
+def report_failures(errors, offset, name, results, failures, max_failures):
+    """Adds `errors` of items to `results` with keys qualified by `name`
+    and item index until `max_failures` items failed. Returns the
+    number of failed items.
+    """
+    for index, item_results in errors.items():
+        if failures == max_failures:
+            break
+        failures += 1
+        prefix = "%s[%d]." % (name, offset + index)
+        for key, result in item_results.items():
+            results[prefix + key] = result
+    return failures
+
+
+def failed_indices(validator, models, gettext):
+    """Returns a list of indices of `models` that failed validation,
+    a model is checked until the first failed rule.
+    """
+    rules = validator.rules
+    inner = validator.inner
+    failed = []
+    result = []
+    model_type = getter = None
+    for index, model in enumerate(models):
+        if type(model) is not model_type:
+            model_type = type(model)
+            getter = ref_getter(model)
+        for name, field_rules in rules:
+            value = getter(model, name)
+            for rule in field_rules:
+                if not rule.validate(value, name, model, result, gettext):
+                    break
+            else:
+                continue
+            del result[:]
+            failed.append(index)
+            break
+        else:
+            for name, inner_validator in inner:
+                if not inner_validator.validate(
+                    getter(model, name), {}, True, None, gettext
+                ):
+                    failed.append(index)
+                    break
+    return failed
+
+
+async def validate_rules_async(
+    awaitable, rules, start, value, name, model, result, stop, gettext
+):
+    """Awaits a result of a field rule and applies field `rules`
+    that follow it, starting from index `start`.
+    """
+    from inspect import isawaitable
+
+    succeed = await awaitable
+    if not succeed and stop:
+        return succeed
+    for rule in rules[start:]:
+        rule_succeed = rule.validate(value, name, model, result, gettext)
+        if isawaitable(rule_succeed):
+            rule_succeed = await rule_succeed
+        succeed &= rule_succeed
+        if not rule_succeed and stop:
+            break
+    return succeed